@@ -6,9 +6,14 @@ Comprehensive analysis of the visualization without browser automation
 
 import re
 import json
+import sqlite3
+import time
 from pathlib import Path
 from collections import defaultdict
 
+from run_history import RunHistory
+from trace_spans import traced
+
 class VisualizationAnalyzer:
     def __init__(self):
         self.html_path = Path('index.html')
@@ -22,6 +27,7 @@ class VisualizationAnalyzer:
             'recommendations': []
         }
 
+    @traced(cat='analysis')
     def analyze_html(self):
         """Analyze the HTML structure"""
         print('🔍 Analyzing HTML Structure...\n')
@@ -123,6 +129,7 @@ class VisualizationAnalyzer:
 
         self.results['html_analysis'] = analysis
 
+    @traced(cat='analysis')
     def analyze_javascript(self):
         """Analyze the JavaScript implementation"""
         print('\n🔍 Analyzing JavaScript Implementation...\n')
@@ -249,6 +256,7 @@ class VisualizationAnalyzer:
 
         self.results['js_analysis'] = analysis
 
+    @traced(cat='analysis')
     def analyze_architecture(self):
         """Analyze the overall architecture"""
         print('\n🏗️  Architecture Analysis...\n')
@@ -293,6 +301,7 @@ class VisualizationAnalyzer:
 
         self.results['architecture'] = architecture
 
+    @traced(cat='analysis')
     def analyze_features(self):
         """Catalog all features"""
         print('\n✨ Feature Catalog...\n')
@@ -352,6 +361,7 @@ class VisualizationAnalyzer:
 
         self.results['features'] = features
 
+    @traced(cat='analysis')
     def estimate_performance(self):
         """Estimate performance characteristics"""
         print('\n⚡ Performance Estimation...\n')
@@ -393,6 +403,7 @@ class VisualizationAnalyzer:
 
         self.results['performance'] = perf
 
+    @traced(cat='analysis')
     def generate_recommendations(self):
         """Generate recommendations"""
         print('\n💡 Recommendations...\n')
@@ -463,6 +474,7 @@ class VisualizationAnalyzer:
 
         self.results['recommendations'] = recommendations
 
+    @traced(cat='analysis')
     def generate_report(self):
         """Generate comprehensive report"""
         print('\n' + '=' * 70)
@@ -521,14 +533,29 @@ def main():
     analyzer = VisualizationAnalyzer()
 
     try:
-        analyzer.analyze_html()
-        analyzer.analyze_javascript()
-        analyzer.analyze_architecture()
-        analyzer.analyze_features()
-        analyzer.estimate_performance()
-        analyzer.generate_recommendations()
+        steps = [
+            ('html', analyzer.analyze_html),
+            ('javascript', analyzer.analyze_javascript),
+            ('architecture', analyzer.analyze_architecture),
+            ('features', analyzer.analyze_features),
+            ('performance', analyzer.estimate_performance),
+            ('recommendations', analyzer.generate_recommendations),
+        ]
+        step_runtime = {}
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            step_runtime[name] = time.perf_counter() - start
+        analyzer.results['step_runtime_s'] = step_runtime
+        analyzer.results['runtime_s'] = sum(step_runtime.values())
         analyzer.generate_report()
 
+        try:
+            with RunHistory() as history:
+                history.record_report('analysis', analyzer.results)
+        except sqlite3.Error as e:
+            print(f'⚠️  Could not record run history: {e}')
+
         print('\n✅ Analysis Complete!\n')
         return 0
 
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Particle Trajectory Baker
+Precomputes the spring-physics particle trajectories from
+`Particle.update` into a compact Float32 lookup table, and verifies the
+baked table against a reference port of the live integrator.
+
+The spring is linear, so y(n) = y0 + distance * progress(n) for every
+particle: one normalized progress curve serves all distances. Horizontal
+drift is likewise vx0 * drift(n). Only the fade-out (which starts once
+|dy| < 30px) depends on the absolute distance, so life curves are baked
+per distance class. Particle size and cache hit/miss only change how a
+particle is drawn, not how it moves, so they need no extra classes.
+
+Binary layout (little-endian):
+    HEADER  magic 'KLPT', version u16, reserved u16, frames u32, classes u32
+    f32[classes]          class distances (px)
+    f32[classes]          lifetime in frames per class
+    f32[frames]           progress: (y - y0) / distance after frame n
+    f32[frames]           drift: (x - x0) / vx0 after frame n
+    f32[classes*frames]   life after frame n, row-major by class
+"""
+
+import argparse
+import random
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+JS_PATH = Path('src/kernel-visualizer.js')
+OUTPUT_PATH = Path('src/particle-trajectories.bin')
+
+MAGIC = b'KLPT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+
+# Defaults mirror Particle.update; load_constants() re-reads them from JS
+DEFAULT_CONSTANTS = {
+    'spring_constant': 0.05,
+    'damping': 0.92,
+    'vx_decay': 0.98,
+    'fade_distance': 30.0,
+    'fade_step': 0.02,
+}
+
+CONSTANT_PATTERNS = {
+    'spring_constant': r'springConstant\s*=\s*([\d.]+)',
+    'damping': r'damping\s*=\s*([\d.]+)',
+    'vx_decay': r'this\.vx\s*\*=\s*([\d.]+)',
+    'fade_distance': r'Math\.abs\(dy\)\s*<\s*([\d.]+)',
+    'fade_step': r'this\.life\s*-=\s*([\d.]+)',
+}
+
+MAX_FRAMES = 10_000
+
+
+def load_constants(js_path):
+    """Read the integrator constants from the JS Particle class"""
+    js = Path(js_path).read_text()
+    body = re.search(r'class\s+Particle\b(.*?)\n\s*draw\(', js, re.DOTALL)
+    if not body:
+        raise ValueError(f'No Particle.update found in {js_path}')
+
+    constants = {}
+    for name, pattern in CONSTANT_PATTERNS.items():
+        match = re.search(pattern, body.group(1))
+        if not match:
+            raise ValueError(f'Could not find {name} in Particle.update ({js_path})')
+        constants[name] = float(match.group(1))
+    return constants
+
+
+def simulate(distance, vx0, constants):
+    """Reference port of Particle.update; yields (y - y0, x - x0, life) per frame until death"""
+    k, damping = constants['spring_constant'], constants['damping']
+    vx_decay = constants['vx_decay']
+    fade_distance, fade_step = constants['fade_distance'], constants['fade_step']
+
+    y = x = vy = 0.0
+    vx = vx0
+    life = 1.0
+    for _ in range(MAX_FRAMES):
+        dy = distance - y
+        vy += dy * k
+        vy *= damping
+        y += vy
+        x += vx
+        vx *= vx_decay
+        if abs(dy) < fade_distance:
+            life -= fade_step
+        yield y, x, life
+        if life <= 0:
+            return
+    raise ValueError(f'Particle at distance {distance} did not die within {MAX_FRAMES} frames')
+
+
+class TrajectoryBaker:
+    def __init__(self, constants, max_distance=480, step=4):
+        self.constants = constants
+        self.distances = [float(d) for d in range(step, max_distance + 1, step)]
+        self.frames = 0
+        self.lifetimes = []
+        self.progress = array('f')
+        self.drift = array('f')
+        self.life = array('f')
+
+    def bake(self):
+        """Integrate once per distance class and fill the tables"""
+        curves = []
+        for distance in self.distances:
+            curve = list(simulate(distance, 1.0, self.constants))
+            curves.append(curve)
+            self.lifetimes.append(len(curve))
+        self.frames = max(self.lifetimes)
+
+        # progress/drift are distance-independent; take them from the longest run
+        longest = max(curves, key=len)
+        reference = self.distances[curves.index(longest)]
+        self.progress = array('f', [y / reference for y, _, _ in longest])
+        self.drift = array('f', [x for _, x, _ in longest])
+
+        self.life = array('f')
+        for curve in curves:
+            lives = [max(0.0, life) for _, _, life in curve]
+            lives.extend([0.0] * (self.frames - len(lives)))
+            self.life.extend(lives)
+        return self
+
+    def class_index(self, distance):
+        """Nearest baked distance class for |distance|"""
+        step = self.distances[0]
+        i = int(round(abs(distance) / step)) - 1
+        return min(len(self.distances) - 1, max(0, i))
+
+    def lookup(self, distance, vx0, frame):
+        """Baked (y - y0, x - x0, life) after `frame` updates, or None once dead"""
+        row = self.class_index(distance)
+        if frame >= self.lifetimes[row]:
+            return None
+        return (
+            distance * self.progress[frame],
+            vx0 * self.drift[frame],
+            self.life[row * self.frames + frame],
+        )
+
+    def verify(self, samples=2000, position_tolerance=0.5, life_tolerance=0.1, seed=0):
+        """Compare baked lookups to the live integrator for random particles"""
+        rng = random.Random(seed)
+        max_distance = self.distances[-1]
+        worst = {'position': 0.0, 'life': 0.0, 'lifetime_frames': 0}
+
+        for _ in range(samples):
+            distance = rng.uniform(1.0, max_distance) * rng.choice((1, -1))
+            vx0 = (rng.random() - 0.5) * 2
+            live = list(simulate(distance, vx0, self.constants))
+            baked_lifetime = self.lifetimes[self.class_index(distance)]
+            worst['lifetime_frames'] = max(worst['lifetime_frames'], abs(len(live) - baked_lifetime))
+
+            for frame, (y, x, life) in enumerate(live):
+                baked = self.lookup(distance, vx0, frame)
+                if baked is None:
+                    worst['life'] = max(worst['life'], max(0.0, life))
+                    continue
+                worst['position'] = max(worst['position'], abs(baked[0] - y), abs(baked[1] - x))
+                worst['life'] = max(worst['life'], abs(baked[2] - max(0.0, life)))
+
+        worst['passed'] = worst['position'] <= position_tolerance and worst['life'] <= life_tolerance
+        return worst
+
+    def to_bytes(self):
+        data = bytearray(HEADER.pack(MAGIC, VERSION, 0, self.frames, len(self.distances)))
+        for table in (array('f', self.distances), array('f', self.lifetimes),
+                      self.progress, self.drift, self.life):
+            if sys.byteorder != 'little':
+                table = array('f', table)
+                table.byteswap()
+            data += table.tobytes()
+        return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bake particle trajectories into a Float32 table')
+    parser.add_argument('--js', type=Path, default=JS_PATH, help='Source of Particle.update constants')
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH)
+    parser.add_argument('--max-distance', type=int, default=480, help='Largest baked distance (px)')
+    parser.add_argument('--step', type=int, default=4, help='Distance class width (px)')
+    parser.add_argument('--samples', type=int, default=2000, help='Random particles to verify')
+    parser.add_argument('--position-tolerance', type=float, default=0.5, help='Max position error (px)')
+    parser.add_argument('--life-tolerance', type=float, default=0.1, help='Max life (alpha) error')
+    args = parser.parse_args()
+
+    try:
+        constants = load_constants(args.js)
+        if constants != DEFAULT_CONSTANTS:
+            print(f'⚠️  Integrator constants differ from defaults: {constants}')
+
+        baker = TrajectoryBaker(constants, args.max_distance, args.step).bake()
+        print(f'🧮 Baked {len(baker.distances)} distance classes × {baker.frames} frames')
+
+        report = baker.verify(args.samples, args.position_tolerance, args.life_tolerance)
+        print(f'  Max position error: {report["position"]:.4f}px (tolerance {args.position_tolerance})')
+        print(f'  Max life error: {report["life"]:.4f} (tolerance {args.life_tolerance})')
+        print(f'  Max lifetime difference: {report["lifetime_frames"]} frames')
+
+        if not report['passed']:
+            print('\n❌ Baked trajectories exceed tolerance - asset not written')
+            return 1
+
+        data = baker.to_bytes()
+        args.output.write_bytes(data)
+        print(f'\n📦 {len(data) / 1024:.1f} KB written to: {args.output}')
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except ValueError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Bundle Builder
+Resolves the ES module graph behind each page, hoists it into a single
+content-hashed bundle (shared config tables emitted once), writes
+precompressed gzip/brotli variants and a manifest, and serves the result
+with immutable caching for hashed assets.
+
+    dist/
+    ├─ index_cinematic.html             # rewritten to load the bundle
+    ├─ manifest.json
+    └─ assets/
+        ├─ index_cinematic.<hash>.js    (+ .gz, + .br when brotli is installed)
+        ├─ write-config.<hash>.js       # lazily imported modules stay separate chunks
+        └─ particle-trajectories.<hash>.bin
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import textwrap
+from functools import partial
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+from trace_chunks import RangeRequestHandler
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_PAGES = ['index_cinematic.html']
+DIST_DIR = Path('dist')
+LEGACY_SCRIPT = Path('kernel-lens.js')
+
+HASH_LENGTH = 10
+COMPRESSIBLE = {'.js', '.html', '.json', '.css', '.svg'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+INLINE_MODULE = re.compile(r'<script type="module">(.*?)</script>', re.DOTALL)
+CDN_SCRIPT = re.compile(r'<script src="(https://[^"]+)"></script>')
+IMPORT = re.compile(r'^\s*import\s*\{([^}]*)\}\s*from\s*[\'"]([^\'"]+)[\'"];?[ \t]*\n?', re.MULTILINE)
+UNSUPPORTED_IMPORT = re.compile(r'^\s*import\s+(?!\{)[^(\n]*from\s', re.MULTILINE)
+EXPORT_LIST = re.compile(r'^\s*export\s*\{', re.MULTILINE)
+EXPORT_KEYWORD = re.compile(r'^export\s+(?=(?:const|let|var|function|async\s+function|class)\b)', re.MULTILINE)
+TOP_LEVEL_DECL = re.compile(
+    r'^(?:export\s+)?(?:const|let|var|function|async\s+function|class)\s+(\w+)', re.MULTILINE
+)
+EXPORTED_DECL = re.compile(r'^export\s+(?:const|let|var|function|async\s+function|class)\s+(\w+)', re.MULTILINE)
+ASSET_URL = re.compile(r'new URL\(\s*[\'"](\./[^\'"]+)[\'"]\s*,\s*import\.meta\.url\s*\)')
+GENERATED_MARKER = 'do not edit by hand'
+DYNAMIC_IMPORT = re.compile(r'import\(\s*[\'"](\./[^\'"]+\.js)[\'"]\s*\)')
+
+
+class BundleError(ValueError):
+    """Raised when a module graph cannot be safely hoisted into one scope"""
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(path, data):
+    return f'{path.stem}.{content_hash(data)}{path.suffix}'
+
+
+def top_level_declarations(source):
+    """Map top-level name -> full declaration text (up to the next top-level statement)"""
+    matches = list(TOP_LEVEL_DECL.finditer(source))
+    decls = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+        lines = EXPORT_KEYWORD.sub('', source[match.start():end]).rstrip().splitlines()
+        # Section banners between declarations belong to the next one
+        while lines and (not lines[-1].strip() or lines[-1].lstrip().startswith('//')):
+            lines.pop()
+        decls[match.group(1)] = '\n'.join(lines)
+    return decls
+
+
+def find_duplicate_tables(paths):
+    """Top-level declarations that appear verbatim in more than one file"""
+    seen = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        source = path.read_text()
+        # Generated modules are self-contained lazy chunks and repeat tables on purpose
+        if GENERATED_MARKER in source:
+            continue
+        for name, text in top_level_declarations(source).items():
+            seen.setdefault((name, ' '.join(text.split())), []).append(path.as_posix())
+    return {name: files for (name, _), files in seen.items() if len(files) > 1}
+
+
+class ModuleGraph:
+    """Static `import { a, b as c } from './x.js'` graph rooted at a page script"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.sources = {}
+        self.order = []
+
+    def parse_imports(self, source, base):
+        if UNSUPPORTED_IMPORT.search(source) or EXPORT_LIST.search(source):
+            raise BundleError(f'Only named imports and declaration exports are supported ({base})')
+        imports = []
+        for match in IMPORT.finditer(source):
+            specifier = match.group(2)
+            if not specifier.startswith('.'):
+                raise BundleError(f'Bare import {specifier!r} in {base} cannot be bundled')
+            target = (base.parent / specifier).resolve()
+            names = []
+            for item in match.group(1).split(','):
+                item = item.strip()
+                if item:
+                    original, _, alias = item.partition(' as ')
+                    names.append((original.strip(), (alias or original).strip()))
+            imports.append((target, names))
+        return imports
+
+    def visit(self, path, stack=()):
+        """Depth-first post-order walk: dependencies land before dependents"""
+        if path in self.sources:
+            return
+        if path in stack:
+            cycle = ' -> '.join(p.name for p in stack + (path,))
+            raise BundleError(f'Import cycle: {cycle}')
+        source = path.read_text()
+        for target, _ in self.parse_imports(source, path):
+            self.visit(target, stack + (path,))
+        self.sources[path] = source
+        self.order.append(path)
+
+    def resolve(self, entry_source, entry_base):
+        for target, _ in self.parse_imports(entry_source, entry_base):
+            self.visit(target)
+        return self.order
+
+
+class BundleBuilder:
+    def __init__(self, root='.', dist=DIST_DIR):
+        self.root = Path(root).resolve()
+        self.dist = Path(dist)
+        self.assets = self.dist / 'assets'
+        self.manifest = {'assets': {}, 'pages': {}}
+
+    # ====================
+    # BUNDLING
+    # ====================
+    def emit_asset(self, path, data):
+        """Write a content-hashed asset and its precompressed variants"""
+        name = hashed_name(path, data)
+        target = self.assets / name
+        target.write_bytes(data)
+        entry = {'file': f'assets/{name}', 'bytes': len(data), 'immutable': True}
+        entry.update(self.precompress(target, data))
+        self.manifest['assets'][path.relative_to(self.root).as_posix()] = entry
+        return name
+
+    def precompress(self, target, data):
+        if target.suffix not in COMPRESSIBLE:
+            return {}
+        sizes = {}
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        Path(f'{target}.gz').write_bytes(gz)
+        sizes['gzip_bytes'] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            Path(f'{target}.br').write_bytes(br)
+            sizes['br_bytes'] = len(br)
+        return sizes
+
+    def rewrite_asset_urls(self, source, base):
+        """Copy `new URL('./x', import.meta.url)` assets and point at the hashed copy"""
+        def replace(match):
+            asset = (base.parent / match.group(1)).resolve()
+            name = self.emit_asset(asset, asset.read_bytes())
+            return f"new URL('./{name}', import.meta.url)"
+        return ASSET_URL.sub(replace, source)
+
+    def rewrite_dynamic_imports(self, source, base, hoisted):
+        """Emit `import('./x.js')` targets as hashed chunks instead of hoisting them
+
+        A target that is already hoisted into the bundle (`hoisted` maps
+        path -> source) resolves to its in-scope bindings instead, so it
+        is not shipped twice.
+        """
+        def replace(match):
+            chunk = (base.parent / match.group(1)).resolve()
+            if chunk in hoisted:
+                names = ', '.join(EXPORTED_DECL.findall(hoisted[chunk]))
+                return f'Promise.resolve({{ {names} }})'
+            chunk_source = chunk.read_text()
+            if IMPORT.search(chunk_source) or DYNAMIC_IMPORT.search(chunk_source):
+                raise BundleError(f'Lazily imported {chunk.name} must not import other modules')
+            name = self.emit_asset(chunk, chunk_source.encode('utf-8'))
+            return f"import('./{name}')"
+        return DYNAMIC_IMPORT.sub(replace, source)
+
+    def hoist(self, graph, entry_source, entry_base):
+        """Concatenate modules into one scope, emitting identical declarations once"""
+        declared = {}
+        parts = []
+        hoisted = {p: graph.sources[p] for p in graph.order}
+
+        for path, source in list(hoisted.items()) + [(entry_base, entry_source)]:
+            label = path.relative_to(self.root).as_posix()
+            aliases = []
+            for _, names in graph.parse_imports(source, path):
+                aliases.extend(f'const {alias} = {original};' for original, alias in names if alias != original)
+
+            body = EXPORT_KEYWORD.sub('', IMPORT.sub('', source))
+            body = self.rewrite_asset_urls(body, path)
+            body = self.rewrite_dynamic_imports(body, path, hoisted)
+            decls = top_level_declarations(body)
+
+            for name, text in decls.items():
+                if name not in declared:
+                    declared[name] = (label, text)
+                    continue
+                owner, existing = declared[name]
+                if ' '.join(existing.split()) != ' '.join(text.split()):
+                    raise BundleError(f'Top-level name {name!r} is declared in both {owner} and {label}')
+                # Shared table already emitted: drop the duplicate declaration
+                body = body.replace(text, f'/* {name}: shared with {owner} */', 1)
+
+            parts.append(f'// ---- {label} ----\n' + '\n'.join(aliases) + ('\n' if aliases else '') + body.strip() + '\n')
+
+        return '\n'.join(parts)
+
+    def build_page(self, page):
+        """Bundle one page's inline module graph and rewrite its HTML"""
+        page = (self.root / page).resolve()
+        html = page.read_text()
+        match = INLINE_MODULE.search(html)
+        if not match:
+            raise BundleError(f'{page.name} has no inline <script type="module">')
+
+        entry_source = textwrap.dedent(match.group(1))
+        graph = ModuleGraph(self.root)
+        graph.resolve(entry_source, page)
+
+        bundle = self.hoist(graph, entry_source, page).encode('utf-8')
+        bundle_path = self.root / f'{page.stem}.js'
+        name = hashed_name(bundle_path, bundle)
+        target = self.assets / name
+        target.write_bytes(bundle)
+        entry = {
+            'file': f'assets/{name}',
+            'bytes': len(bundle),
+            'immutable': True,
+            'modules': [p.relative_to(self.root).as_posix() for p in graph.order],
+        }
+        entry.update(self.precompress(target, bundle))
+        self.manifest['assets'][f'{page.stem}.bundle.js'] = entry
+
+        # Module scripts run after parsing, so CDN scripts can be deferred too
+        html = html[:match.start()] + f'<script type="module" src="assets/{name}"></script>' + html[match.end():]
+        html = CDN_SCRIPT.sub(lambda m: f'<script src="{m.group(1)}" defer></script>', html)
+        out = self.dist / page.name
+        out.write_text(html)
+        self.precompress(out, html.encode('utf-8'))
+        self.manifest['pages'][page.name] = {'bundle': entry['file'], 'modules': entry['modules']}
+        return entry
+
+    def build(self, pages):
+        if self.dist.exists():
+            shutil.rmtree(self.dist)
+        self.assets.mkdir(parents=True)
+        for page in pages:
+            self.build_page(page)
+        (self.dist / 'manifest.json').write_text(json.dumps(self.manifest, indent=2))
+        return self.manifest
+
+
+# ====================
+# SERVER
+# ====================
+class BundleRequestHandler(RangeRequestHandler):
+    """Serves dist/ with immutable caching for manifest assets and precompressed variants"""
+
+    immutable = frozenset()
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        encoding = None
+        if not self.headers.get('Range') and os.path.isfile(path):
+            accepted = self.headers.get('Accept-Encoding', '')
+            for suffix, name in (('.br', 'br'), ('.gz', 'gzip')):
+                if name in accepted and os.path.isfile(path + suffix):
+                    encoding = name
+                    self.path = self.path.split('?', 1)[0] + suffix
+                    break
+        self._content_encoding = encoding
+        self._content_type = self.guess_type(path)
+        self._cache_control = IMMUTABLE if self.path_key(path) in self.immutable else 'no-cache'
+        return super().send_head()
+
+    def path_key(self, path):
+        return Path(path).relative_to(Path(self.directory).resolve()).as_posix()
+
+    def send_header(self, keyword, value):
+        # Keep the original type when serving a .gz/.br sibling
+        if keyword == 'Content-type' and getattr(self, '_content_encoding', None):
+            value = self._content_type
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        if getattr(self, '_cache_control', None):
+            self.send_header('Cache-Control', self._cache_control)
+            self._cache_control = None
+        if getattr(self, '_content_encoding', None):
+            self.send_header('Content-Encoding', self._content_encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+            self._content_encoding = None
+        super().end_headers()
+
+
+def serve(dist=DIST_DIR, host='127.0.0.1', port=8000):
+    """Serve a built dist/ directory using its manifest for cache headers"""
+    dist = Path(dist).resolve()
+    manifest = json.loads((dist / 'manifest.json').read_text())
+    immutable = frozenset(entry['file'] for entry in manifest['assets'].values())
+    handler = partial(
+        type('ManifestRequestHandler', (BundleRequestHandler,), {'immutable': immutable}),
+        directory=str(dist),
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f'🌐 Serving {dist} ({len(immutable)} immutable assets) on http://{host}:{port}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build content-hashed, precompressed bundles')
+    parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES, help='Pages with an inline module script')
+    parser.add_argument('--dist', type=Path, default=DIST_DIR)
+    parser.add_argument('--serve', action='store_true', help='Serve dist/ after building')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        builder = BundleBuilder('.', args.dist)
+        manifest = builder.build(args.pages)
+
+        print('📦 Bundles:')
+        for name, entry in manifest['assets'].items():
+            sizes = f'{entry["bytes"]} B'
+            if 'gzip_bytes' in entry:
+                sizes += f', gzip {entry["gzip_bytes"]} B'
+            if 'br_bytes' in entry:
+                sizes += f', br {entry["br_bytes"]} B'
+            print(f'  {name} → {entry["file"]} ({sizes})')
+        if brotli is None:
+            print('  ⚠️  brotli not installed - only gzip variants written')
+
+        duplicates = find_duplicate_tables([LEGACY_SCRIPT] + sorted(Path('src').rglob('*.js')))
+        if duplicates:
+            print('\n🔁 Tables duplicated outside the module graph:')
+            for name, files in sorted(duplicates.items()):
+                print(f'  {name}: {", ".join(files)}')
+
+        print(f'\n📄 Manifest saved to: {args.dist / "manifest.json"}')
+        if args.serve:
+            serve(args.dist, port=args.port)
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except BundleError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Morph Path Normalizer
+Parses the `shapes` SVG paths of a syscall config, reports their
+complexity and per-transition interpolation cost, and precomputes
+point-count-matched cubic paths for every adjacent layer transition.
+
+GSAP tweens `attr: { d }` by interpolating the numbers of the start and
+end strings pairwise. When the two paths have different command
+structures (arcs vs lines, 1 vs 4 subpaths) the tween has nothing
+sensible to pair. The emitted paths share an identical `M C... Z`
+structure per transition, so the browser interpolates them directly.
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+CONFIG_PATH = Path('src/syscalls/read-config.js')
+
+TOKEN_PATTERN = re.compile(r'[MmLlHhVvCcAaZz]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PARAM_COUNTS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'A': 7, 'Z': 0}
+
+
+# ====================
+# PARSING
+# ====================
+def tokenize(d):
+    return TOKEN_PATTERN.findall(d)
+
+
+def parse_commands(d):
+    """Split a path string into (command, [params]) tuples, expanding repeats"""
+    commands = []
+    tokens = tokenize(d)
+    i = 0
+    cmd = None
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            cmd = token
+            i += 1
+            if cmd in 'Zz':
+                commands.append((cmd, []))
+                continue
+        elif cmd is None:
+            raise ValueError(f'Path must start with a command: {d!r}')
+
+        count = PARAM_COUNTS.get(cmd.upper())
+        if count is None:
+            raise ValueError(f'Unsupported path command {cmd!r}')
+        params = [float(t) for t in tokens[i:i + count]]
+        if len(params) != count:
+            raise ValueError(f'Command {cmd!r} expects {count} numbers in {d!r}')
+        commands.append((cmd, params))
+        i += count
+
+        # Extra coordinate pairs after a moveto are implicit linetos
+        if cmd == 'M':
+            cmd = 'L'
+        elif cmd == 'm':
+            cmd = 'l'
+    return commands
+
+
+def arc_to_cubics(x1, y1, rx, ry, phi_deg, large_arc, sweep, x2, y2):
+    """Convert an SVG elliptical arc into cubic segments (SVG spec F.6.5)"""
+    if (x1, y1) == (x2, y2):
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return [line_to_cubic((x1, y1), (x2, y2))]
+
+    phi = math.radians(phi_deg)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+
+    # Scale radii up if they cannot span the endpoints
+    scale = (x1p ** 2) / (rx ** 2) + (y1p ** 2) / (ry ** 2)
+    if scale > 1:
+        rx *= math.sqrt(scale)
+        ry *= math.sqrt(scale)
+
+    num = rx ** 2 * ry ** 2 - rx ** 2 * y1p ** 2 - ry ** 2 * x1p ** 2
+    den = rx ** 2 * y1p ** 2 + ry ** 2 * x1p ** 2
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+    def angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    theta1 = angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    delta = angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    segments = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / segments
+    k = 4 / 3 * math.tan(step / 4)
+
+    def point(t):
+        return (
+            cx + rx * math.cos(t) * cos_phi - ry * math.sin(t) * sin_phi,
+            cy + rx * math.cos(t) * sin_phi + ry * math.sin(t) * cos_phi,
+        )
+
+    def derivative(t):
+        return (
+            -rx * math.sin(t) * cos_phi - ry * math.cos(t) * sin_phi,
+            -rx * math.sin(t) * sin_phi + ry * math.cos(t) * cos_phi,
+        )
+
+    cubics = []
+    t = theta1
+    for _ in range(segments):
+        p0, p3 = point(t), point(t + step)
+        d0, d3 = derivative(t), derivative(t + step)
+        cubics.append((
+            p0,
+            (p0[0] + k * d0[0], p0[1] + k * d0[1]),
+            (p3[0] - k * d3[0], p3[1] - k * d3[1]),
+            p3,
+        ))
+        t += step
+    # Pin the final endpoint exactly to avoid float drift
+    last = cubics[-1]
+    cubics[-1] = (last[0], last[1], last[2], (x2, y2))
+    return cubics
+
+
+def line_to_cubic(p0, p1):
+    return (
+        p0,
+        (p0[0] + (p1[0] - p0[0]) / 3, p0[1] + (p1[1] - p0[1]) / 3),
+        (p0[0] + 2 * (p1[0] - p0[0]) / 3, p0[1] + 2 * (p1[1] - p0[1]) / 3),
+        p1,
+    )
+
+
+def to_subpaths(d):
+    """Parse a path into a list of closed subpaths of absolute cubic segments"""
+    subpaths = []
+    current = []
+    x = y = 0.0
+    start = (0.0, 0.0)
+
+    def finish():
+        if current:
+            if _distance(current[-1][3], start) > 1e-6:
+                current.append(line_to_cubic(current[-1][3], start))
+            subpaths.append(list(current))
+            current.clear()
+
+    for cmd, params in parse_commands(d):
+        rel = cmd.islower()
+        op = cmd.upper()
+        if op == 'M':
+            finish()
+            x, y = (x + params[0], y + params[1]) if rel else (params[0], params[1])
+            start = (x, y)
+        elif op in 'LHV':
+            if op == 'L':
+                nx, ny = (x + params[0], y + params[1]) if rel else params
+            elif op == 'H':
+                nx, ny = (x + params[0] if rel else params[0]), y
+            else:
+                nx, ny = x, (y + params[0] if rel else params[0])
+            current.append(line_to_cubic((x, y), (nx, ny)))
+            x, y = nx, ny
+        elif op == 'C':
+            pts = [(x + params[j], y + params[j + 1]) if rel else (params[j], params[j + 1])
+                   for j in range(0, 6, 2)]
+            current.append(((x, y), pts[0], pts[1], pts[2]))
+            x, y = pts[2]
+        elif op == 'A':
+            nx, ny = (x + params[5], y + params[6]) if rel else (params[5], params[6])
+            current.extend(arc_to_cubics(x, y, params[0], params[1], params[2],
+                                         bool(params[3]), bool(params[4]), nx, ny))
+            x, y = nx, ny
+        elif op == 'Z':
+            finish()
+            x, y = start
+    finish()
+    return subpaths
+
+
+# ====================
+# ANALYSIS
+# ====================
+def analyze_path(d):
+    """Command, subpath and vertex counts for one raw path string"""
+    commands = parse_commands(d)
+    letters = [c.upper() for c, _ in commands]
+    subpaths = to_subpaths(d)
+    return {
+        'commands': len(commands),
+        'command_mix': {op: letters.count(op) for op in sorted(set(letters))},
+        'numbers': sum(len(p) for _, p in commands),
+        'subpaths': len(subpaths),
+        'vertices': sum(1 for c, _ in commands if c.upper() in 'MLHVCA'),
+        'cubic_segments': sum(len(s) for s in subpaths),
+    }
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def _segment_length(seg):
+    # Control-polygon length: an upper bound that is cheap and monotone
+    return sum(_distance(seg[j], seg[j + 1]) for j in range(3))
+
+
+def _split(seg, t=0.5):
+    p0, p1, p2, p3 = seg
+    lerp = lambda a, b: (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+    a, b, c = lerp(p0, p1), lerp(p1, p2), lerp(p2, p3)
+    d, e = lerp(a, b), lerp(b, c)
+    f = lerp(d, e)
+    return (p0, a, d, f), (f, e, c, p3)
+
+
+def _centroid(subpath):
+    points = [seg[0] for seg in subpath]
+    return (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+
+
+def _subdivide(subpath, count):
+    """Split the longest segments until the subpath has `count` segments"""
+    segments = list(subpath)
+    while len(segments) < count:
+        i = max(range(len(segments)), key=lambda j: _segment_length(segments[j]))
+        segments[i:i + 1] = _split(segments[i])
+    return segments
+
+
+def _reverse(subpath):
+    return [(s[3], s[2], s[1], s[0]) for s in reversed(subpath)]
+
+
+def _align(source, target):
+    """Rotate/reverse closed `target` to minimize vertex travel from `source`"""
+    best, best_cost = target, float('inf')
+    for candidate in (target, _reverse(target)):
+        n = len(candidate)
+        for shift in range(n):
+            rotated = candidate[shift:] + candidate[:shift]
+            cost = sum(_distance(a[0], b[0]) ** 2 for a, b in zip(source, rotated))
+            if cost < best_cost:
+                best, best_cost = rotated, cost
+    return best
+
+
+def _degenerate(point, count):
+    return [(point, point, point, point)] * count
+
+
+def match_paths(from_d, to_d):
+    """Return (from_subpaths, to_subpaths) with identical segment structure"""
+    a, b = to_subpaths(from_d), to_subpaths(to_d)
+
+    # Pad the side with fewer subpaths with points that grow/shrink in place
+    while len(a) < len(b):
+        partner = b[len(a)]
+        a.append(_degenerate(_centroid(partner), 1))
+    while len(b) < len(a):
+        partner = a[len(b)]
+        b.append(_degenerate(_centroid(partner), 1))
+
+    matched_a, matched_b = [], []
+    for sa, sb in zip(a, b):
+        count = max(len(sa), len(sb))
+        sa, sb = _subdivide(sa, count), _subdivide(sb, count)
+        matched_a.append(sa)
+        matched_b.append(_align(sa, sb))
+    return matched_a, matched_b
+
+
+def _fmt(value):
+    text = f'{value:.2f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+def format_subpaths(subpaths):
+    """Serialize cubic subpaths as an absolute `M x,y C ... Z` path string"""
+    parts = []
+    for subpath in subpaths:
+        start = subpath[0][0]
+        parts.append(f'M {_fmt(start[0])},{_fmt(start[1])}')
+        for _, c1, c2, end in subpath:
+            parts.append(
+                f'C {_fmt(c1[0])},{_fmt(c1[1])} {_fmt(c2[0])},{_fmt(c2[1])} {_fmt(end[0])},{_fmt(end[1])}'
+            )
+        parts.append('Z')
+    return ' '.join(parts)
+
+
+def analyze_transition(from_d, to_d):
+    """Interpolation cost of a raw vs normalized morph between two paths"""
+    raw_from, raw_to = parse_commands(from_d), parse_commands(to_d)
+    structure_match = [c for c, _ in raw_from] == [c for c, _ in raw_to] and all(
+        len(p) == len(q) for (_, p), (_, q) in zip(raw_from, raw_to)
+    )
+    matched_from, matched_to = match_paths(from_d, to_d)
+    segments = sum(len(s) for s in matched_from)
+    return {
+        'raw_numbers': [sum(len(p) for _, p in raw_from), sum(len(p) for _, p in raw_to)],
+        'raw_structure_match': structure_match,
+        'subpaths': len(matched_from),
+        'cubic_segments': segments,
+        # Floats GSAP interpolates per frame: 2 per moveto + 6 per cubic
+        'interpolated_numbers': 2 * len(matched_from) + 6 * segments,
+        'from': format_subpaths(matched_from),
+        'to': format_subpaths(matched_to),
+    }
+
+
+# ====================
+# CONFIG I/O
+# ====================
+def load_config(path):
+    """Extract `shapes` and the layer shape order from a syscall config module"""
+    js = Path(path).read_text()
+    block = re.search(r'shapes\s*=\s*\{(.*?)\};', js, re.DOTALL)
+    if not block:
+        raise ValueError(f'No shapes table found in {path}')
+    shapes = dict(re.findall(r'(\w+):\s*"([^"]+)"', block.group(1)))
+    order = re.findall(r"shape:\s*'(\w+)'", js)
+    missing = [name for name in order if name not in shapes]
+    if missing:
+        raise ValueError(f'Layers reference undefined shapes: {missing}')
+    return shapes, order
+
+
+def build_transitions(shapes, order):
+    """Matched paths for each adjacent pair in layer order"""
+    transitions = {}
+    for prev, current in zip(order, order[1:]):
+        transitions[f'{prev}->{current}'] = analyze_transition(shapes[prev], shapes[current])
+    return transitions
+
+
+def render_module(transitions, source):
+    lines = [
+        '// ============================================',
+        '// PRECOMPUTED MORPH PATHS (generated)',
+        '// ============================================',
+        f'// Generated by morph_paths.py from {source} - do not edit by hand.',
+        '// Each transition has identical M/C/Z structure on both ends, so GSAP',
+        '// interpolates the numbers pairwise without resampling.',
+        '',
+        'export const morphPaths = {',
+    ]
+    for key, t in transitions.items():
+        lines.append(f"    '{key}': {{")
+        lines.append(f"        from: {json.dumps(t['from'])},")
+        lines.append(f"        to: {json.dumps(t['to'])}")
+        lines.append('    },')
+    lines[-1] = '    }'
+    lines.append('};')
+    return '\n'.join(lines) + '\n'
+
+
+def default_output(config_path):
+    name = Path(config_path).name.replace('-config.js', '-morph-paths.js')
+    return Path(config_path).with_name(name)
+
+
+def print_report(shapes, order, transitions):
+    print('📐 Shape Complexity:\n')
+    for name in order:
+        info = analyze_path(shapes[name])
+        mix = ', '.join(f'{k}={v}' for k, v in info['command_mix'].items())
+        print(f'  {name:8} commands={info["commands"]:3} subpaths={info["subpaths"]} '
+              f'vertices={info["vertices"]:3} numbers={info["numbers"]:3} ({mix})')
+
+    print('\n🔀 Transition Cost:\n')
+    for key, t in transitions.items():
+        status = '✓' if t['raw_structure_match'] else '✗'
+        print(f'  {status} {key:14} raw numbers {t["raw_numbers"][0]:3} → {t["raw_numbers"][1]:3} | '
+              f'normalized: {t["subpaths"]} subpaths, {t["cubic_segments"]} cubics, '
+              f'{t["interpolated_numbers"]} floats/frame')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze and normalize morph paths')
+    parser.add_argument('--config', type=Path, default=CONFIG_PATH)
+    parser.add_argument('--output', type=Path, help='Generated module (default: <syscall>-morph-paths.js)')
+    parser.add_argument('--report-only', action='store_true', help='Print the report without writing the asset')
+    parser.add_argument('--json', type=Path, help='Also write the full report as JSON')
+    args = parser.parse_args()
+
+    try:
+        shapes, order = load_config(args.config)
+        transitions = build_transitions(shapes, order)
+        print_report(shapes, order, transitions)
+
+        if args.json:
+            report = {
+                'shapes': {name: analyze_path(shapes[name]) for name in order},
+                'transitions': transitions,
+            }
+            args.json.write_text(json.dumps(report, indent=2))
+            print(f'\n📄 Report saved to: {args.json}')
+
+        if not args.report_only:
+            output = args.output or default_output(args.config)
+            output.write_text(render_module(transitions, args.config.as_posix()))
+            print(f'\n📦 Morph paths written to: {output}')
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except ValueError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
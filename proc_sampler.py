@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens /proc Sampler
+Drives LIVE MODE from the real host: samples /proc/vmstat, /proc/diskstats
+and optionally /proc/<pid>/io at a fixed rate, turns consecutive
+snapshots into rates (page-cache hit ratio, read ops/s, bytes/s), and
+pushes them to the page as Server-Sent Events on /live.
+
+Files are opened once and re-read with pread() at offset 0, so each
+sample costs one syscall per file and no path lookups.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+READ_CHUNK = 64 * 1024
+SECTOR_BYTES = 512
+
+VMSTAT_KEYS = (b'pgpgin', b'pgfault', b'pgmajfault')
+PID_IO_KEYS = (b'rchar', b'syscr', b'read_bytes')
+
+# Slider ranges in the page; live values are clamped to them
+SIZE_RANGE = (1024, 16384)
+
+# Longest a client waits for a sample before re-checking for shutdown
+CLIENT_WAIT_S = 5.0
+
+
+def whole_disks():
+    """Block devices that are whole disks (not partitions, loop or ram devices)"""
+    try:
+        names = os.listdir('/sys/block')
+    except OSError:
+        return None
+    return {n.encode() for n in names if not n.startswith(('loop', 'ram', 'zram'))}
+
+
+class ProcSampler:
+    def __init__(self, pid=None, proc='/proc'):
+        self.pid = pid
+        self.disks = whole_disks()
+        self.fds = {
+            'vmstat': os.open(f'{proc}/vmstat', os.O_RDONLY),
+            'diskstats': os.open(f'{proc}/diskstats', os.O_RDONLY),
+        }
+        if pid is not None:
+            self.fds['io'] = os.open(f'{proc}/{pid}/io', os.O_RDONLY)
+        self.previous = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds = {}
+
+    def drop_process(self):
+        """Stop sampling /proc/<pid>/io; returns False if it was not being sampled"""
+        fd = self.fds.pop('io', None)
+        if fd is None:
+            return False
+        os.close(fd)
+        return True
+
+    def _read(self, name):
+        """Re-read an already open /proc file from the start"""
+        fd = self.fds[name]
+        data = os.pread(fd, READ_CHUNK, 0)
+        if len(data) == READ_CHUNK:
+            chunks = [data]
+            while len(data) == READ_CHUNK:
+                data = os.pread(fd, READ_CHUNK, READ_CHUNK * len(chunks))
+                chunks.append(data)
+            data = b''.join(chunks)
+        return data
+
+    @staticmethod
+    def _parse_keyed(data, keys, separator=b' '):
+        """Pull a few `key<sep>value` lines out of a /proc file without splitting it all"""
+        values = {}
+        data = b'\n' + data
+        for key in keys:
+            start = data.find(b'\n' + key + separator)
+            if start < 0:
+                continue
+            start += len(key) + len(separator) + 1
+            end = data.find(b'\n', start)
+            values[key.decode()] = int(data[start:end if end >= 0 else None])
+        return values
+
+    def snapshot(self):
+        """Raw cumulative counters at this instant"""
+        snap = {'time': time.monotonic()}
+        snap.update(self._parse_keyed(self._read('vmstat'), VMSTAT_KEYS))
+
+        reads = sectors = 0
+        for line in self._read('diskstats').split(b'\n'):
+            fields = line.split()
+            if len(fields) < 6 or (self.disks is not None and fields[2] not in self.disks):
+                continue
+            reads += int(fields[3])
+            sectors += int(fields[5])
+        snap['disk_reads'] = reads
+        snap['disk_read_bytes'] = sectors * SECTOR_BYTES
+
+        if 'io' in self.fds:
+            try:
+                snap.update(self._parse_keyed(self._read('io'), PID_IO_KEYS, b': '))
+            except OSError as e:
+                # The process exited (ESRCH): carry on with system-wide counters
+                self.drop_process()
+                print(f'⚠️  pid {self.pid} can no longer be sampled ({e}); '
+                      f'falling back to system-wide samples', file=sys.stderr)
+        return snap
+
+    def sample(self):
+        """Rates since the previous snapshot (None on the first call)"""
+        current = self.snapshot()
+        previous, self.previous = self.previous, current
+        if previous is None:
+            return None
+
+        elapsed = current['time'] - previous['time']
+        delta = {k: current[k] - previous[k] for k in current if k != 'time' and k in previous}
+
+        sample = {
+            'elapsed_s': round(elapsed, 4),
+            'read_ops_per_s': round(delta['disk_reads'] / elapsed, 1),
+            'read_bytes_per_s': round(delta['disk_read_bytes'] / elapsed),
+        }
+
+        if 'rchar' in delta:
+            # Bytes the process asked for vs. bytes that actually hit storage
+            requested, fetched = delta['rchar'], delta['read_bytes']
+            sample['source'] = f'pid {self.pid}'
+            sample['cache_hit'] = 100.0 if requested <= 0 else round(
+                max(0.0, 1 - fetched / requested) * 100, 1)
+            sample['size'] = delta['rchar'] // delta['syscr'] if delta['syscr'] else None
+        else:
+            # System-wide: share of page faults served without I/O
+            faults, major = delta['pgfault'], delta['pgmajfault']
+            sample['source'] = 'system'
+            sample['cache_hit'] = 100.0 if faults <= 0 else round((1 - major / faults) * 100, 1)
+            sample['size'] = delta['disk_read_bytes'] // delta['disk_reads'] if delta['disk_reads'] else None
+
+        if sample['size'] is not None:
+            sample['size'] = min(SIZE_RANGE[1], max(SIZE_RANGE[0], sample['size']))
+        return sample
+
+
+# ====================
+# LOCAL STREAM
+# ====================
+class SampleBroadcaster:
+    """Runs one sampler thread and hands the latest sample to every client"""
+
+    def __init__(self, sampler, rate_hz):
+        self.sampler = sampler
+        self.interval = 1.0 / rate_hz
+        self.condition = threading.Condition()
+        self.latest = None
+        self.sequence = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.sampler.sample()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self.stopped.is_set():
+            next_tick += self.interval
+            try:
+                sample = self.sampler.sample()
+            except (OSError, ValueError) as e:
+                # Release waiting clients instead of leaving them on a dead thread
+                print(f'\n❌ Sampling stopped: {e}', file=sys.stderr)
+                self.stop()
+                return
+            with self.condition:
+                self.latest = sample
+                self.sequence += 1
+                self.condition.notify_all()
+            self.stopped.wait(max(0.0, next_tick - time.monotonic()))
+
+    def wait(self, seen, timeout=CLIENT_WAIT_S):
+        """Block until a sample newer than `seen` exists, the stream stops or
+        `timeout` passes; returns (sequence, sample), sequence == seen on timeout"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence > seen or self.stopped.is_set(), timeout)
+            return self.sequence, self.latest
+
+
+class LiveStreamHandler(BaseHTTPRequestHandler):
+    broadcaster = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/live':
+            self.send_error(404, 'Use /live')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        seen = 0
+        try:
+            while not self.broadcaster.stopped.is_set():
+                sequence, sample = self.broadcaster.wait(seen)
+                if sequence == seen:
+                    # No new sample: an SSE comment keeps the connection checked
+                    self.wfile.write(b': waiting\n\n')
+                elif sample is not None:
+                    self.wfile.write(b'data: ' + json.dumps(sample).encode() + b'\n\n')
+                seen = sequence
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(sampler, rate_hz=20, host='127.0.0.1', port=8002):
+    broadcaster = SampleBroadcaster(sampler, rate_hz)
+    handler = type('BoundLiveStreamHandler', (LiveStreamHandler,), {'broadcaster': broadcaster})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    broadcaster.start()
+    print(f'🔴 Streaming /proc samples at {rate_hz} Hz on http://{host}:{port}/live')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broadcaster.stop()
+        server.server_close()
+
+
+def benchmark(sampler, rate_hz, seconds):
+    """CPU used by sampling alone, as a percentage of one core"""
+    interval = 1.0 / rate_hz
+    sampler.sample()
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    next_tick = wall_start
+    samples = 0
+    while time.monotonic() - wall_start < seconds:
+        next_tick += interval
+        sampler.sample()
+        samples += 1
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    return {'samples': samples, 'cpu_percent': cpu / wall * 100, 'us_per_sample': cpu / samples * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sample /proc and stream LIVE MODE metrics')
+    parser.add_argument('--pid', type=int, help='Also sample /proc/<pid>/io for per-process cache hits')
+    parser.add_argument('--rate', type=float, default=20.0, help='Samples per second')
+    parser.add_argument('--port', type=int, default=8002)
+    parser.add_argument('--benchmark', type=float, metavar='SECONDS',
+                        help='Measure sampler CPU cost instead of serving')
+    args = parser.parse_args()
+
+    try:
+        with ProcSampler(args.pid) as sampler:
+            if args.benchmark:
+                result = benchmark(sampler, args.rate, args.benchmark)
+                status = '✓' if result['cpu_percent'] < 1.0 else '✗'
+                print(f'{status} {result["samples"]} samples at {args.rate} Hz: '
+                      f'{result["cpu_percent"]:.3f}% of one core '
+                      f'({result["us_per_sample"]:.0f} μs/sample)')
+                print(f'  Last sample: {sampler.sample()}')
+                return 0 if result['cpu_percent'] < 1.0 else 1
+            serve(sampler, args.rate, port=args.port)
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except PermissionError as e:
+        print(f'\n❌ Error: Permission denied (another user\'s /proc/<pid>/io needs root): {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Run History
+SQLite-backed history of test_visualization.py and analyze-visualization.py
+runs, keyed by git commit and timestamp, with trend queries and a
+regression check (Welch's t-test of recent runs against a baseline
+window) for FPS, heap MB and analysis runtime.
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+HISTORY_PATH = Path('run-history.sqlite')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_tool_time ON runs(tool, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_commit ON runs(git_commit);
+CREATE INDEX IF NOT EXISTS idx_metrics_name_run ON metrics(name, run_id);
+'''
+
+# Metrics watched for regressions: True when higher is better
+WATCHED = {
+    'fps': True,
+    'heap_used_mb': False,
+    'heap_total_mb': False,
+    'runtime_s': False,
+}
+
+
+def git_commit():
+    """HEAD commit and whether the working tree has uncommitted changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def playwright_metrics(report):
+    """Numeric metrics from a playwright-report.json payload"""
+    tests = report.get('tests', [])
+    metrics = {
+        'tests_total': len(tests),
+        'tests_passed': sum(1 for t in tests if t['passed']),
+        'errors': len(report.get('errors', [])),
+    }
+    perf = report.get('performance') or {}
+    if perf.get('fps') is not None:
+        metrics['fps'] = perf['fps']
+    if perf.get('memory'):
+        metrics['heap_used_mb'] = perf['memory']['used']
+        metrics['heap_total_mb'] = perf['memory']['total']
+    first_frame = report.get('first_frame') or {}
+    for label in ('source', 'bundle'):
+        if label in first_frame:
+            metrics[f'first_frame_{label}_ms'] = first_frame[label]['median_ms']
+    return metrics
+
+
+def analysis_metrics(report):
+    """Numeric metrics from a static-analysis-report.json payload"""
+    metrics = {'recommendations': len(report.get('recommendations', []))}
+    if report.get('runtime_s') is not None:
+        metrics['runtime_s'] = report['runtime_s']
+    for step, seconds in (report.get('step_runtime_s') or {}).items():
+        metrics[f'runtime_{step}_s'] = seconds
+    return metrics
+
+
+EXTRACTORS = {'playwright': playwright_metrics, 'analysis': analysis_metrics}
+
+
+class RunHistory:
+    def __init__(self, path=HISTORY_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def record_many(self, runs):
+        """Insert [(tool, metrics, timestamp)] in one transaction; returns run ids"""
+        commit, dirty = git_commit()
+        ids = []
+        with self.conn:
+            for tool, metrics, timestamp in runs:
+                cursor = self.conn.execute(
+                    'INSERT INTO runs (tool, git_commit, dirty, timestamp) VALUES (?, ?, ?, ?)',
+                    (tool, commit, int(dirty), timestamp or datetime.now().isoformat()),
+                )
+                ids.append(cursor.lastrowid)
+                self.conn.executemany(
+                    'INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)',
+                    [(cursor.lastrowid, name, float(value)) for name, value in metrics.items()
+                     if isinstance(value, (int, float))],
+                )
+        return ids
+
+    def record(self, tool, metrics, timestamp=None):
+        return self.record_many([(tool, metrics, timestamp)])[0]
+
+    def record_report(self, tool, report):
+        """Extract metrics from a tool's JSON report payload and append them"""
+        return self.record(tool, EXTRACTORS[tool](report), report.get('timestamp'))
+
+    def trend(self, metric, tool=None, limit=20):
+        """Most recent values of `metric`, oldest first: [(timestamp, commit, dirty, value)]"""
+        query = '''
+            SELECT r.timestamp, r.git_commit, r.dirty, m.value
+            FROM metrics m JOIN runs r ON r.id = m.run_id
+            WHERE m.name = ?{tool_filter}
+            ORDER BY r.timestamp DESC, r.id DESC
+            LIMIT ?
+        '''.format(tool_filter=' AND r.tool = ?' if tool else '')
+        params = (metric, tool, limit) if tool else (metric, limit)
+        return list(reversed(self.conn.execute(query, params).fetchall()))
+
+    def metric_names(self):
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT name FROM metrics ORDER BY name')]
+
+
+# ====================
+# STATISTICS
+# ====================
+def _betacf(a, b, x):
+    """Continued fraction for the regularized incomplete beta (Numerical Recipes)"""
+    qab, qap, qam = a + b, a + 1, a - 1
+    c, d = 1.0, 1 - qab * x / qap
+    d = 1 / (d if abs(d) > 1e-30 else 1e-30)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > 1e-30 else 1e-30)
+        c = 1 + aa / c if abs(1 + aa / c) > 1e-30 else 1e-30
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > 1e-30 else 1e-30)
+        c = 1 + aa / c if abs(1 + aa / c) > 1e-30 else 1e-30
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-10:
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def welch_t_test(recent, baseline):
+    """Two-sided Welch's t-test; returns (t, p-value)"""
+    n1, n2 = len(recent), len(baseline)
+    m1, m2 = statistics.fmean(recent), statistics.fmean(baseline)
+    v1 = statistics.variance(recent) if n1 > 1 else 0.0
+    v2 = statistics.variance(baseline) if n2 > 1 else 0.0
+    se2 = v1 / n1 + v2 / n2
+    if se2 == 0:
+        return (0.0, 1.0) if m1 == m2 else (math.copysign(math.inf, m1 - m2), 0.0)
+    t = (m1 - m2) / math.sqrt(se2)
+    dof_den = (v1 / n1) ** 2 / max(n1 - 1, 1) + (v2 / n2) ** 2 / max(n2 - 1, 1)
+    dof = se2 ** 2 / dof_den if dof_den else float(n1 + n2 - 2)
+    p = _betainc(dof / 2, 0.5, dof / (dof + t * t))
+    return t, p
+
+
+def find_regressions(history, recent=3, baseline=10, alpha=0.05, min_change=0.05, tool=None):
+    """Watched metrics whose recent runs are significantly worse than the baseline"""
+    findings = []
+    for metric, higher_is_better in WATCHED.items():
+        values = [row[3] for row in history.trend(metric, tool, recent + baseline)]
+        if len(values) < recent + 2:
+            continue
+        base, last = values[:-recent], values[-recent:]
+        t, p = welch_t_test(last, base)
+        base_mean, last_mean = statistics.fmean(base), statistics.fmean(last)
+        change = (last_mean - base_mean) / base_mean if base_mean else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        if worse and p < alpha and abs(change) >= min_change:
+            findings.append({
+                'metric': metric,
+                'baseline_mean': base_mean,
+                'recent_mean': last_mean,
+                'change': change,
+                't': t,
+                'p': p,
+            })
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the Kernel Lens run history')
+    parser.add_argument('--db', type=Path, default=HISTORY_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    trend = sub.add_parser('trend', help='Show recent values of a metric')
+    trend.add_argument('metric', nargs='?', help='Metric name (omit to list metrics)')
+    trend.add_argument('--tool', choices=sorted(EXTRACTORS))
+    trend.add_argument('--limit', type=int, default=20)
+
+    check = sub.add_parser('check', help='Flag statistically significant regressions')
+    check.add_argument('--recent', type=int, default=3, help='Runs treated as the candidate')
+    check.add_argument('--baseline', type=int, default=10, help='Runs before them used as baseline')
+    check.add_argument('--alpha', type=float, default=0.05)
+    check.add_argument('--min-change', type=float, default=0.05, help='Ignore changes below this fraction')
+    check.add_argument('--tool', choices=sorted(EXTRACTORS))
+
+    imp = sub.add_parser('import', help='Append an existing JSON report')
+    imp.add_argument('tool', choices=sorted(EXTRACTORS))
+    imp.add_argument('report', type=Path)
+
+    args = parser.parse_args()
+
+    try:
+        with RunHistory(args.db) as history:
+            if args.command == 'import':
+                run_id = history.record_report(args.tool, json.loads(args.report.read_text()))
+                print(f'🗃️  Recorded {args.report} as run {run_id}')
+
+            elif args.command == 'trend':
+                if not args.metric:
+                    print('📈 Metrics: ' + ', '.join(history.metric_names()))
+                    return 0
+                rows = history.trend(args.metric, args.tool, args.limit)
+                print(f'📈 {args.metric} (last {len(rows)} runs)\n')
+                for timestamp, commit, dirty, value in rows:
+                    print(f'  {timestamp[:19]}  {commit[:10]}{"*" if dirty else " "}  {value:12.4g}')
+
+            else:
+                findings = find_regressions(history, args.recent, args.baseline,
+                                            args.alpha, args.min_change, args.tool)
+                if not findings:
+                    print('✅ No significant regressions')
+                    return 0
+                print('🔴 Regressions:\n')
+                for f in findings:
+                    print(f'  {f["metric"]}: {f["baseline_mean"]:.4g} → {f["recent_mean"]:.4g} '
+                          f'({f["change"]:+.1%}, t={f["t"]:.2f}, p={f["p"]:.4f})')
+                return 1
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except sqlite3.Error as e:
+        print(f'\n❌ Error: History database error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
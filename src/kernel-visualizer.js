@@ -3,8 +3,11 @@
 // ============================================
 // Refactored from kernel-lens.js to support multiple instances
 
-import { shapes, layers as defaultLayers } from './syscalls/read-config.js';
+import { shapes, layers as defaultLayers, syscallName } from './syscalls/read-config.js';
+import { morphPaths } from './syscalls/read-morph-paths.js';
+import { loadSyscallConfig } from './syscalls/catalog.js';
 import { getLevelConfig, DEFAULT_LEVEL } from './levels/level-configs.js';
+import { loadTrajectoryTable } from './particle-trajectories.js';
 
 export class KernelVisualizer {
     constructor(containerId, config = {}) {
@@ -24,12 +27,18 @@ export class KernelVisualizer {
             fd: config.fd || 3,
             size: config.size || 4096,
             cacheHit: config.cacheHit || 85,
+            ioOps: null,            // Measured read ops/s when a live source is connected
             currentLayer: 0
         };
 
+        // Live /proc stream (see proc_sampler.py)
+        this.liveSource = null;
+
         // Layer configuration (deep copy to allow per-instance modifications)
+        this.syscallName = syscallName;
         this.shapes = { ...shapes };
         this.layers = JSON.parse(JSON.stringify(defaultLayers));
+        this.morphPaths = morphPaths;
 
         // Animation timeline
         this.morphTimeline = null;
@@ -39,6 +48,7 @@ export class KernelVisualizer {
         this.ctx = null;
         this.particles = [];
         this.animationFrameId = null;
+        this.trajectoryTable = null;
 
         // Initialize
         this.init();
@@ -49,6 +59,7 @@ export class KernelVisualizer {
     // ====================
     init() {
         this.setupCanvas();
+        this.loadTrajectories();
         this.setupEventListeners();
         this.createMorphingFlow();
         this.updateMetrics();
@@ -67,6 +78,13 @@ export class KernelVisualizer {
         this.canvas.height = this.canvas.offsetHeight;
     }
 
+    loadTrajectories() {
+        // Baked spring trajectories; particles integrate live until loaded
+        loadTrajectoryTable(new URL('./particle-trajectories.bin', import.meta.url))
+            .then(table => { this.trajectoryTable = table; })
+            .catch(err => console.warn('Particle trajectories unavailable:', err.message));
+    }
+
     setupEventListeners() {
         // File descriptor slider
         const fdInput = document.getElementById('fd-input');
@@ -126,7 +144,8 @@ export class KernelVisualizer {
                 fromY,
                 toY,
                 color,
-                isCacheHit
+                isCacheHit,
+                this.trajectoryTable
             ));
         }
     }
@@ -148,9 +167,16 @@ export class KernelVisualizer {
             const prevLayer = this.layers[i - 1];
             const startTime = i * 2 / this.levelConfig.animationSpeed;
 
+            // Swap in the structure-matched start path (visually identical to
+            // the previous shape) so GSAP interpolates numbers pairwise
+            const morph = this.morphPaths[`${prevLayer.shape}->${layer.shape}`];
+            if (morph) {
+                this.morphTimeline.set('#data-shape', { attr: { d: morph.from } }, startTime);
+            }
+
             // Morph shape with elastic easing
             this.morphTimeline.to('#data-shape', {
-                attr: { d: this.shapes[layer.shape] },
+                attr: { d: morph ? morph.to : this.shapes[layer.shape] },
                 fill: layer.color,
                 duration: duration,
                 ease: "elastic.out(1, 0.5)"
@@ -223,8 +249,9 @@ export class KernelVisualizer {
     // METRICS & UI UPDATES
     // ====================
     updateMetrics() {
-        const ioOps = Math.ceil((100 - this.state.cacheHit) / 100 * Math.ceil(this.state.size / 4096));
-        const totalTime = 1 + 0.5 + 2 + (ioOps * 10) + (ioOps * 150);
+        const modeledIoOps = Math.ceil((100 - this.state.cacheHit) / 100 * Math.ceil(this.state.size / 4096));
+        const totalTime = 1 + 0.5 + 2 + (modeledIoOps * 10) + (modeledIoOps * 150);
+        const ioOps = this.state.ioOps ?? modeledIoOps;
 
         // Animate metrics with GSAP
         const timeMetric = document.getElementById('time-metric');
@@ -271,7 +298,9 @@ export class KernelVisualizer {
         if (fdDisplay) {
             fdDisplay.textContent = `fd=${this.state.fd}`;
         }
-        this.layers[0].label = `fd=${this.state.fd}`;
+        if (this.layers[0].label.startsWith('fd=')) {
+            this.layers[0].label = `fd=${this.state.fd}`;
+        }
         this.updateMetrics();
     }
 
@@ -315,6 +344,76 @@ export class KernelVisualizer {
         }
     }
 
+    async selectSyscall(name) {
+        // Other syscalls' configs are fetched on first selection (see catalog.js)
+        const config = await loadSyscallConfig(name);
+        this.syscallName = config.syscallName;
+        this.shapes = { ...config.shapes };
+        this.layers = JSON.parse(JSON.stringify(config.layers));
+        this.morphPaths = config.morphPaths;
+
+        const dataShape = document.getElementById('data-shape');
+        if (dataShape) dataShape.setAttribute('d', this.shapes[this.layers[0].shape]);
+        const dataLabel = document.getElementById('data-label');
+        if (dataLabel) dataLabel.textContent = this.layers[0].label;
+
+        this.createMorphingFlow();
+        return config;
+    }
+
+    connectLiveSource(url = 'http://127.0.0.1:8002/live') {
+        this.disconnectLiveSource();
+        const source = this.liveSource = new EventSource(url);
+        source.onmessage = (e) => this.applyLiveSample(JSON.parse(e.data));
+        source.onopen = () => this.showLiveStatus('host');
+        // EventSource retries on its own; only a closed source is final
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                this.disconnectLiveSource();
+            } else {
+                this.showLiveStatus('reconnecting');
+            }
+        };
+        this.showLiveStatus('connecting');
+    }
+
+    disconnectLiveSource() {
+        if (this.liveSource) {
+            this.liveSource.close();
+            this.liveSource = null;
+        }
+        this.state.ioOps = null;
+        this.showLiveStatus(null);
+    }
+
+    showLiveStatus(status) {
+        const indicator = document.getElementById('live-indicator');
+        if (indicator) indicator.classList.toggle('host', status !== null);
+        const source = document.getElementById('live-source');
+        if (source) source.textContent = status ? `· ${status}` : '';
+    }
+
+    applyLiveSample(sample) {
+        this.state.cacheHit = Math.round(sample.cache_hit);
+        if (sample.size) {
+            this.state.size = sample.size;
+        }
+        this.state.ioOps = Math.round(sample.read_ops_per_s);
+
+        // Keep sliders in sync with the host values
+        const cacheInput = document.getElementById('cache-input');
+        if (cacheInput) cacheInput.value = this.state.cacheHit;
+        const cacheDisplay = document.getElementById('cache-display');
+        if (cacheDisplay) cacheDisplay.textContent = `${this.state.cacheHit}%`;
+
+        const sizeInput = document.getElementById('size-input');
+        if (sizeInput) sizeInput.value = this.state.size;
+        const sizeDisplay = document.getElementById('size-display');
+        if (sizeDisplay) sizeDisplay.textContent = `${this.state.size}B`;
+
+        this.updateMetrics();
+    }
+
     setDifficulty(level) {
         this.difficulty = level;
         this.levelConfig = getLevelConfig(level);
@@ -323,6 +422,7 @@ export class KernelVisualizer {
 
     destroy() {
         // Clean up
+        this.disconnectLiveSource();
         if (this.morphTimeline) {
             this.morphTimeline.kill();
         }
@@ -337,7 +437,7 @@ export class KernelVisualizer {
 // PARTICLE CLASS
 // ====================
 class Particle {
-    constructor(x, y, targetY, color, isCacheHit) {
+    constructor(x, y, targetY, color, isCacheHit, table = null) {
         this.x = x;
         this.y = y;
         this.targetY = targetY;
@@ -347,9 +447,24 @@ class Particle {
         this.life = 1.0;
         this.isCacheHit = isCacheHit;
         this.size = isCacheHit ? 3 : 2;
+
+        // Baked trajectory lookup (see bake_particles.py)
+        this.table = table;
+        if (table) {
+            this.x0 = x;
+            this.y0 = y;
+            this.vx0 = this.vx;
+            this.distance = targetY - y;
+            this.row = table.classIndex(this.distance);
+            this.frame = 0;
+        }
     }
 
     update() {
+        if (this.table) {
+            return this.lookup();
+        }
+
         // Spring physics
         const dy = this.targetY - this.y;
         const springConstant = 0.05;
@@ -370,6 +485,20 @@ class Particle {
         return this.life > 0;
     }
 
+    lookup() {
+        const t = this.table;
+        const f = this.frame++;
+        if (f >= t.lifetimes[this.row]) {
+            return false;
+        }
+
+        this.y = this.y0 + this.distance * t.progress[f];
+        this.x = this.x0 + this.vx0 * t.drift[f];
+        this.life = t.life[this.row * t.frames + f];
+
+        return this.life > 0;
+    }
+
     draw(ctx) {
         ctx.fillStyle = this.color;
         ctx.globalAlpha = this.life * (this.isCacheHit ? 0.8 : 0.6);
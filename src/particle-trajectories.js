@@ -0,0 +1,50 @@
+// ============================================
+// BAKED PARTICLE TRAJECTORIES
+// ============================================
+// Lookup tables produced by bake_particles.py. Replaces per-frame spring
+// integration in Particle.update with a few typed-array reads.
+
+const MAGIC = 'KLPT';
+const VERSION = 1;
+const HEADER_BYTES = 16;
+
+export class TrajectoryTable {
+    constructor(buffer) {
+        const view = new DataView(buffer);
+        const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+        if (magic !== MAGIC || view.getUint16(4, true) !== VERSION) {
+            throw new Error('Unsupported particle trajectory table');
+        }
+
+        this.frames = view.getUint32(8, true);
+        this.classes = view.getUint32(12, true);
+
+        let offset = HEADER_BYTES;
+        const take = (length) => {
+            const table = new Float32Array(buffer, offset, length);
+            offset += length * 4;
+            return table;
+        };
+
+        this.distances = take(this.classes);
+        this.lifetimes = take(this.classes);
+        this.progress = take(this.frames);
+        this.drift = take(this.frames);
+        this.life = take(this.classes * this.frames);
+        this.step = this.distances[0];
+    }
+
+    // Nearest baked distance class for a particle travelling `distance` px
+    classIndex(distance) {
+        const i = Math.round(Math.abs(distance) / this.step) - 1;
+        return Math.min(this.classes - 1, Math.max(0, i));
+    }
+}
+
+export async function loadTrajectoryTable(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Failed to load ${url}: ${response.status}`);
+    }
+    return new TrajectoryTable(await response.arrayBuffer());
+}
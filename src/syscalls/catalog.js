@@ -0,0 +1,39 @@
+// ============================================
+// SYSCALL CATALOG (generated)
+// ============================================
+// Generated by syscall_configs.py - do not edit by hand.
+// Only names are loaded at startup; a config module is fetched the
+// first time its syscall is selected.
+
+export const syscallCatalog = [
+    { name: 'read', number: 0, signature: "read(fd, buf, count)" },
+    { name: 'write', number: 1, signature: "write(fd, buf, count)" },
+    { name: 'mmap', number: 9, signature: "mmap(addr, length, prot, flags, fd, offset)" },
+    { name: 'openat', number: 257, signature: "openat(dirfd, pathname, flags, mode)" },
+    { name: 'io_uring_enter', number: 426, signature: "io_uring_enter(fd, to_submit, min_complete, flags)" }
+];
+
+const loaders = {
+    read: () => Promise.all([import('./read-config.js'), import('./read-morph-paths.js')])
+        .then(([config, paths]) => ({ ...config, morphPaths: paths.morphPaths })),
+    write: () => import('./write-config.js'),
+    mmap: () => import('./mmap-config.js'),
+    openat: () => import('./openat-config.js'),
+    io_uring_enter: () => import('./io_uring_enter-config.js')
+};
+
+const loaded = new Map();
+
+export function loadSyscallConfig(name) {
+    if (!loaders[name]) {
+        return Promise.reject(new Error(`Unknown syscall '${name}'`));
+    }
+    if (!loaded.has(name)) {
+        // Forget failed loads so the next selection retries the import
+        loaded.set(name, loaders[name]().catch(err => {
+            loaded.delete(name);
+            throw err;
+        }));
+    }
+    return loaded.get(name);
+}
@@ -0,0 +1,109 @@
+// ============================================
+// IO_URING_ENTER SYSCALL CONFIGURATION (generated)
+// ============================================
+// Generated by syscall_configs.py from syscall-specs/io_uring_enter.json - do not edit by hand.
+// Shapes are placed on their layer and normalized to cubics; morph paths
+// are structure-matched for each adjacent transition.
+
+export const shapes = {
+    ring: "M 250,80 C 250,96.57 263.43,110 280,110 C 296.57,110 310,96.57 310,80 C 310,63.43 296.57,50 280,50 C 263.43,50 250,63.43 250,80 Z M 265,80 C 265,88.28 271.72,95 280,95 C 288.28,95 295,88.28 295,80 C 295,71.72 288.28,65 280,65 C 271.72,65 265,71.72 265,80 Z",
+    bars: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+    tree: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z",
+    grid: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z",
+    queue: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+    ring_device: "M 250,425 C 250,441.57 263.43,455 280,455 C 296.57,455 310,441.57 310,425 C 310,408.43 296.57,395 280,395 C 263.43,395 250,408.43 250,425 Z M 265,425 C 265,433.28 271.72,440 280,440 C 288.28,440 295,433.28 295,425 C 295,416.72 288.28,410 280,410 C 271.72,410 265,416.72 265,425 Z"
+};
+
+export const layers = [
+    {
+        "shape": "ring",
+        "color": "#f093fb",
+        "y": 80,
+        "label": "SQE",
+        "tooltip": {
+            "title": "User Space",
+            "desc": "Application fills submission-queue entries in shared memory, then enters the kernel once for the batch",
+            "code": "sqe = io_uring_get_sqe(&amp;ring);\nio_uring_prep_read(sqe, fd, buf, len, offset);\nio_uring_submit(&amp;ring);"
+        }
+    },
+    {
+        "shape": "bars",
+        "color": "#4facfe",
+        "y": 150,
+        "label": "Registers",
+        "tooltip": {
+            "title": "System Call Entry",
+            "desc": "CPU switches to kernel mode via SYSCALL instruction",
+            "code": "RAX=426 (syscall number)\nRDI=ring_fd\nRSI=to_submit\nRDX=min_complete\nR10=flags"
+        }
+    },
+    {
+        "shape": "tree",
+        "color": "#43e97b",
+        "y": 215,
+        "label": "io_kiocb",
+        "tooltip": {
+            "title": "io_uring Submission",
+            "desc": "io_submit_sqes turns each SQE into a request and issues it through the file's read_iter",
+            "code": "io_submit_sqes(ctx, to_submit);\nreq = io_alloc_req(ctx);\nio_read(req, issue_flags) -&gt; call_read_iter();"
+        }
+    },
+    {
+        "shape": "grid",
+        "color": "#fa709a",
+        "y": 285,
+        "label": "Blocks",
+        "tooltip": {
+            "title": "Filesystem Layer",
+            "desc": "ext4 maps file offsets to blocks; with O_DIRECT the page cache is bypassed",
+            "code": "ext4_file_read_iter(iocb, to);\niomap_dio_rw(iocb, to, &amp;ext4_iomap_ops, NULL, 0, NULL, 0);"
+        }
+    },
+    {
+        "shape": "queue",
+        "color": "#fee140",
+        "y": 355,
+        "label": "Queue",
+        "tooltip": {
+            "title": "Block I/O Layer",
+            "desc": "BIOs are queued and the submitter returns without waiting for them",
+            "code": "bio = bio_alloc(bdev, nr, REQ_OP_READ, gfp);\nsubmit_bio(bio);\nreturn -EIOCBQUEUED;"
+        }
+    },
+    {
+        "shape": "ring_device",
+        "color": "#30cfd0",
+        "y": 425,
+        "label": "CQE",
+        "tooltip": {
+            "title": "Completion",
+            "desc": "On completion the result is posted as a CQE that the application reaps without another syscall",
+            "code": "blk_mq_complete_request(rq);\nio_req_complete_post(req, issue_flags);\ncqe-&gt;res = bytes_read;"
+        }
+    }
+];
+
+export const morphPaths = {
+    'ring->bars': {
+        from: "M 250,80 C 250,96.57 263.43,110 280,110 C 296.57,110 310,96.57 310,80 C 310,63.43 296.57,50 280,50 C 263.43,50 250,63.43 250,80 Z M 265,80 C 265,88.28 271.72,95 280,95 C 288.28,95 295,88.28 295,80 C 295,71.72 288.28,65 280,65 C 271.72,65 265,71.72 265,80 Z M 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 Z",
+        to: "M 260,135 C 260,140 260,145 260,150 C 286.67,150 313.33,150 340,150 C 340,145 340,140 340,135 C 313.33,135 286.67,135 260,135 Z M 260,155 C 260,160 260,165 260,170 C 286.67,170 313.33,170 340,170 C 340,165 340,160 340,155 C 313.33,155 286.67,155 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z"
+    },
+    'bars->tree': {
+        from: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+        to: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z"
+    },
+    'tree->grid': {
+        from: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z M 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 Z",
+        to: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z"
+    },
+    'grid->queue': {
+        from: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z",
+        to: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z"
+    },
+    'queue->ring_device': {
+        from: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+        to: "M 250,425 C 250,408.43 263.43,395 280,395 C 296.57,395 310,408.43 310,425 C 310,441.57 296.57,455 280,455 C 263.43,455 250,441.57 250,425 Z M 265,425 C 265,416.72 271.72,410 280,410 C 288.28,410 295,416.72 295,425 C 295,433.28 288.28,440 280,440 C 271.72,440 265,433.28 265,425 Z M 290,360 C 290,360 290,360 290,360 C 290,360 290,360 290,360 C 290,360 290,360 290,360 C 290,360 290,360 290,360 Z M 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 Z"
+    }
+};
+
+export const syscallName = 'io_uring_enter';
@@ -0,0 +1,109 @@
+// ============================================
+// MMAP SYSCALL CONFIGURATION (generated)
+// ============================================
+// Generated by syscall_configs.py from syscall-specs/mmap.json - do not edit by hand.
+// Shapes are placed on their layer and normalized to cubics; morph paths
+// are structure-matched for each adjacent transition.
+
+export const shapes = {
+    circle: "M 260,80 C 260,91.05 268.95,100 280,100 C 291.05,100 300,91.05 300,80 C 300,68.95 291.05,60 280,60 C 268.95,60 260,68.95 260,80 Z",
+    bars: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+    tree: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z",
+    pages: "M 255,265 C 275,265 295,265 315,265 C 315,278.33 315,291.67 315,305 C 295,305 275,305 255,305 C 255,291.67 255,278.33 255,265 Z M 270,273 C 290,273 310,273 330,273 C 330,286.33 330,299.67 330,313 C 310,313 290,313 270,313 C 270,299.67 270,286.33 270,273 Z M 285,281 C 305,281 325,281 345,281 C 345,294.33 345,307.67 345,321 C 325,321 305,321 285,321 C 285,307.67 285,294.33 285,281 Z",
+    queue: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+    device: "M 250,410 C 283.33,410 316.67,410 350,410 C 350,423.33 350,436.67 350,450 C 316.67,450 283.33,450 250,450 C 250,436.67 250,423.33 250,410 Z M 270,420 C 273.33,420 276.67,420 280,420 C 280,423.33 280,426.67 280,430 C 276.67,430 273.33,430 270,430 C 270,426.67 270,423.33 270,420 Z M 320,420 C 323.33,420 326.67,420 330,420 C 330,423.33 330,426.67 330,430 C 326.67,430 323.33,430 320,430 C 320,426.67 320,423.33 320,420 Z"
+};
+
+export const layers = [
+    {
+        "shape": "circle",
+        "color": "#f093fb",
+        "y": 80,
+        "label": "addr",
+        "tooltip": {
+            "title": "User Space",
+            "desc": "Application maps a file into its address space instead of copying it",
+            "code": "mmap(NULL, length, PROT_READ, MAP_PRIVATE, fd, 0)"
+        }
+    },
+    {
+        "shape": "bars",
+        "color": "#4facfe",
+        "y": 150,
+        "label": "Registers",
+        "tooltip": {
+            "title": "System Call Entry",
+            "desc": "CPU switches to kernel mode via SYSCALL instruction",
+            "code": "RAX=9 (syscall number)\nRDI=addr (NULL)\nRSI=length\nRDX=prot\nR10=flags\nR8=fd\nR9=offset"
+        }
+    },
+    {
+        "shape": "tree",
+        "color": "#43e97b",
+        "y": 215,
+        "label": "VMA",
+        "tooltip": {
+            "title": "VFS / Memory Map",
+            "desc": "do_mmap reserves a virtual range and creates a VMA; no data is read yet",
+            "code": "vm_mmap_pgoff(file, addr, len, prot, flags, pgoff);\nvma = vm_area_alloc(mm);\ncall_mmap(file, vma);"
+        }
+    },
+    {
+        "shape": "pages",
+        "color": "#fa709a",
+        "y": 285,
+        "label": "Fault",
+        "tooltip": {
+            "title": "Page Fault",
+            "desc": "The first access faults; filemap_fault looks the page up in the page cache",
+            "code": "handle_mm_fault(vma, address, flags, regs);\nfilemap_fault(vmf);\nfolio = filemap_get_folio(mapping, index);"
+        }
+    },
+    {
+        "shape": "queue",
+        "color": "#fee140",
+        "y": 355,
+        "label": "Readahead",
+        "tooltip": {
+            "title": "Block I/O Layer",
+            "desc": "A page-cache miss issues readahead BIOs for the surrounding pages",
+            "code": "page_cache_sync_ra(&amp;ractl, ra_pages);\next4_mpage_readpages() -&gt; submit_bio();"
+        }
+    },
+    {
+        "shape": "device",
+        "color": "#30cfd0",
+        "y": 425,
+        "label": "Device",
+        "tooltip": {
+            "title": "Device Driver",
+            "desc": "DMA fills the page, the PTE is installed and the faulting access retries",
+            "code": "nvme_setup_rw(ns, req, cmd, nvme_cmd_read);\nDMA: device_buffer -&gt; page;\nset_pte_at(mm, addr, pte, entry)"
+        }
+    }
+];
+
+export const morphPaths = {
+    'circle->bars': {
+        from: "M 260,80 C 260,91.05 268.95,100 280,100 C 291.05,100 300,91.05 300,80 C 300,68.95 291.05,60 280,60 C 268.95,60 260,68.95 260,80 Z M 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 Z M 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 Z",
+        to: "M 260,135 C 260,140 260,145 260,150 C 286.67,150 313.33,150 340,150 C 340,145 340,140 340,135 C 313.33,135 286.67,135 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z"
+    },
+    'bars->tree': {
+        from: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+        to: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z"
+    },
+    'tree->pages': {
+        from: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z",
+        to: "M 255,265 C 275,265 295,265 315,265 C 315,278.33 315,291.67 315,305 C 295,305 275,305 255,305 C 255,291.67 255,278.33 255,265 Z M 270,273 C 290,273 310,273 330,273 C 330,286.33 330,299.67 330,313 C 310,313 290,313 270,313 C 270,299.67 270,286.33 270,273 Z M 285,281 C 305,281 325,281 345,281 C 345,294.33 345,307.67 345,321 C 325,321 305,321 285,321 C 285,307.67 285,294.33 285,281 Z"
+    },
+    'pages->queue': {
+        from: "M 255,265 C 275,265 295,265 315,265 C 315,278.33 315,291.67 315,305 C 295,305 275,305 255,305 C 255,291.67 255,278.33 255,265 Z M 270,273 C 290,273 310,273 330,273 C 330,286.33 330,299.67 330,313 C 310,313 290,313 270,313 C 270,299.67 270,286.33 270,273 Z M 285,281 C 305,281 325,281 345,281 C 345,294.33 345,307.67 345,321 C 325,321 305,321 285,321 C 285,307.67 285,294.33 285,281 Z M 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 Z",
+        to: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z"
+    },
+    'queue->device': {
+        from: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+        to: "M 250,410 C 283.33,410 316.67,410 350,410 C 350,423.33 350,436.67 350,450 C 316.67,450 283.33,450 250,450 C 250,436.67 250,423.33 250,410 Z M 270,420 C 273.33,420 276.67,420 280,420 C 280,423.33 280,426.67 280,430 C 276.67,430 273.33,430 270,430 C 270,426.67 270,423.33 270,420 Z M 320,420 C 323.33,420 326.67,420 330,420 C 330,423.33 330,426.67 330,430 C 326.67,430 323.33,430 320,430 C 320,426.67 320,423.33 320,420 Z M 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 Z"
+    }
+};
+
+export const syscallName = 'mmap';
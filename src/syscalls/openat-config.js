@@ -0,0 +1,109 @@
+// ============================================
+// OPENAT SYSCALL CONFIGURATION (generated)
+// ============================================
+// Generated by syscall_configs.py from syscall-specs/openat.json - do not edit by hand.
+// Shapes are placed on their layer and normalized to cubics; morph paths
+// are structure-matched for each adjacent transition.
+
+export const shapes = {
+    circle: "M 260,80 C 260,91.05 268.95,100 280,100 C 291.05,100 300,91.05 300,80 C 300,68.95 291.05,60 280,60 C 268.95,60 260,68.95 260,80 Z",
+    bars: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+    tree: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z",
+    grid: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z",
+    queue: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+    device: "M 250,410 C 283.33,410 316.67,410 350,410 C 350,423.33 350,436.67 350,450 C 316.67,450 283.33,450 250,450 C 250,436.67 250,423.33 250,410 Z M 270,420 C 273.33,420 276.67,420 280,420 C 280,423.33 280,426.67 280,430 C 276.67,430 273.33,430 270,430 C 270,426.67 270,423.33 270,420 Z M 320,420 C 323.33,420 326.67,420 330,420 C 330,423.33 330,426.67 330,430 C 326.67,430 323.33,430 320,430 C 320,426.67 320,423.33 320,420 Z"
+};
+
+export const layers = [
+    {
+        "shape": "circle",
+        "color": "#f093fb",
+        "y": 80,
+        "label": "path",
+        "tooltip": {
+            "title": "User Space",
+            "desc": "Application asks to open a path relative to a directory fd",
+            "code": "openat(AT_FDCWD, \"/etc/hosts\", O_RDONLY)"
+        }
+    },
+    {
+        "shape": "bars",
+        "color": "#4facfe",
+        "y": 150,
+        "label": "Registers",
+        "tooltip": {
+            "title": "System Call Entry",
+            "desc": "CPU switches to kernel mode via SYSCALL instruction",
+            "code": "RAX=257 (syscall number)\nRDI=AT_FDCWD (-100)\nRSI=pathname\nRDX=flags\nR10=mode"
+        }
+    },
+    {
+        "shape": "tree",
+        "color": "#43e97b",
+        "y": 215,
+        "label": "dentry",
+        "tooltip": {
+            "title": "VFS Layer",
+            "desc": "Path walk resolves each component through the dentry cache and reserves an fd",
+            "code": "fd = get_unused_fd_flags(flags);\nfile = do_filp_open(dfd, name, &amp;op);\npath_openat() -&gt; link_path_walk()"
+        }
+    },
+    {
+        "shape": "grid",
+        "color": "#fa709a",
+        "y": 285,
+        "label": "inode",
+        "tooltip": {
+            "title": "Filesystem Layer",
+            "desc": "On a dentry cache miss ext4 searches the directory and loads the inode",
+            "code": "ext4_lookup(dir, dentry, flags);\ninode = ext4_iget(sb, ino, EXT4_IGET_NORMAL);\nfile-&gt;f_op = &amp;ext4_file_operations;"
+        }
+    },
+    {
+        "shape": "queue",
+        "color": "#fee140",
+        "y": 355,
+        "label": "Metadata",
+        "tooltip": {
+            "title": "Block I/O Layer",
+            "desc": "Uncached directory and inode blocks are read through the buffer cache",
+            "code": "bh = ext4_bread(NULL, dir, block, 0);\nsubmit_bh(REQ_OP_READ | REQ_META, bh);"
+        }
+    },
+    {
+        "shape": "device",
+        "color": "#30cfd0",
+        "y": 425,
+        "label": "fd=3",
+        "tooltip": {
+            "title": "Device Driver",
+            "desc": "Device returns the metadata blocks; warm opens never reach this layer",
+            "code": "nvme_setup_rw(ns, req, cmd, nvme_cmd_read);\nIRQ on completion;\nfd_install(fd, file) -&gt; returns 3"
+        }
+    }
+];
+
+export const morphPaths = {
+    'circle->bars': {
+        from: "M 260,80 C 260,91.05 268.95,100 280,100 C 291.05,100 300,91.05 300,80 C 300,68.95 291.05,60 280,60 C 268.95,60 260,68.95 260,80 Z M 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 C 300,162.5 300,162.5 300,162.5 Z M 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 C 300,182.5 300,182.5 300,182.5 Z",
+        to: "M 260,135 C 260,140 260,145 260,150 C 286.67,150 313.33,150 340,150 C 340,145 340,140 340,135 C 313.33,135 286.67,135 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z"
+    },
+    'bars->tree': {
+        from: "M 260,135 C 286.67,135 313.33,135 340,135 C 340,140 340,145 340,150 C 313.33,150 286.67,150 260,150 C 260,145 260,140 260,135 Z M 260,155 C 286.67,155 313.33,155 340,155 C 340,160 340,165 340,170 C 313.33,170 286.67,170 260,170 C 260,165 260,160 260,155 Z M 260,175 C 286.67,175 313.33,175 340,175 C 340,180 340,185 340,190 C 313.33,190 286.67,190 260,190 C 260,185 260,180 260,175 Z",
+        to: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z"
+    },
+    'tree->grid': {
+        from: "M 250,200 C 283.33,200 316.67,200 350,200 C 350,216.67 350,233.33 350,250 C 316.67,250 283.33,250 250,250 C 250,233.33 250,216.67 250,200 Z M 255,210 C 258.33,210 261.67,210 265,210 C 265,213.33 265,216.67 265,220 C 261.67,220 258.33,220 255,220 C 255,216.67 255,213.33 255,210 Z M 255,230 C 285,230 315,230 345,230 C 345,233.33 345,236.67 345,240 C 315,240 285,240 255,240 C 255,236.67 255,233.33 255,230 Z M 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 C 305,310 305,310 305,310 Z",
+        to: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z"
+    },
+    'grid->queue': {
+        from: "M 265,270 C 271.67,270 278.33,270 285,270 C 285,276.67 285,283.33 285,290 C 278.33,290 271.67,290 265,290 C 265,283.33 265,276.67 265,270 Z M 295,270 C 301.67,270 308.33,270 315,270 C 315,276.67 315,283.33 315,290 C 308.33,290 301.67,290 295,290 C 295,283.33 295,276.67 295,270 Z M 265,300 C 271.67,300 278.33,300 285,300 C 285,306.67 285,313.33 285,320 C 278.33,320 271.67,320 265,320 C 265,313.33 265,306.67 265,300 Z M 295,300 C 301.67,300 308.33,300 315,300 C 315,306.67 315,313.33 315,320 C 308.33,320 301.67,320 295,320 C 295,313.33 295,306.67 295,300 Z",
+        to: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z"
+    },
+    'queue->device': {
+        from: "M 240,340 C 280,340 320,340 360,340 C 360,353.33 360,366.67 360,380 C 320,380 280,380 240,380 C 240,366.67 240,353.33 240,340 Z M 250,350 C 256.67,350 263.33,350 270,350 C 270,356.67 270,363.33 270,370 C 263.33,370 256.67,370 250,370 C 250,363.33 250,356.67 250,350 Z M 280,350 C 286.67,350 293.33,350 300,350 C 300,356.67 300,363.33 300,370 C 293.33,370 286.67,370 280,370 C 280,363.33 280,356.67 280,350 Z M 310,350 C 316.67,350 323.33,350 330,350 C 330,356.67 330,363.33 330,370 C 323.33,370 316.67,370 310,370 C 310,363.33 310,356.67 310,350 Z",
+        to: "M 250,410 C 283.33,410 316.67,410 350,410 C 350,423.33 350,436.67 350,450 C 316.67,450 283.33,450 250,450 C 250,436.67 250,423.33 250,410 Z M 270,420 C 273.33,420 276.67,420 280,420 C 280,423.33 280,426.67 280,430 C 276.67,430 273.33,430 270,430 C 270,426.67 270,423.33 270,420 Z M 320,420 C 323.33,420 326.67,420 330,420 C 330,423.33 330,426.67 330,430 C 326.67,430 323.33,430 320,430 C 320,426.67 320,423.33 320,420 Z M 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 C 320,360 320,360 320,360 Z"
+    }
+};
+
+export const syscallName = 'openat';
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Syscall Config Generator
+Turns compact per-syscall specs (syscall-specs/<name>.json) into validated,
+precomputed config modules (src/syscalls/<name>-config.js) plus a small
+catalog module the page imports at startup.
+
+A spec only carries what differs between syscalls: labels, tooltip text
+and optional custom shapes. Layer y-positions and colors come from the
+fixed layer zones in the page; shapes come from the read() config's
+library or the spec, are placed on their layer and normalized to cubics;
+morph paths for every adjacent transition are precomputed with
+morph_paths.py. Each generated module is self-contained, so selecting a
+syscall costs one dynamic import and nothing is parsed at startup beyond
+the catalog's name list.
+
+Spec format:
+
+    {
+      "name": "write",
+      "number": 1,
+      "signature": "write(fd, buf, count)",
+      "shapes": {"pages": "M -40,-20 L 40,-20 ..."},   # optional, relative to (300, layer y)
+      "layers": {
+        "user": {"label": "fd=3", "title": "User Space", "desc": "...", "code": "...",
+                 "shape": "circle", "color": "#f093fb"},   # shape/color optional
+        ... one entry for each of user, syscall, vfs, fs, block, device
+      }
+    }
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+from pathlib import Path
+
+from morph_paths import CONFIG_PATH, analyze_transition, format_subpaths, load_config, to_subpaths
+from trace_index import LAYERS
+
+SPEC_DIR = Path('syscall-specs')
+OUTPUT_DIR = Path('src/syscalls')
+CATALOG_NAME = 'catalog.js'
+
+# Hand-written built-in config, loaded together with its morph paths module
+BUILTIN = {'name': 'read', 'number': 0, 'signature': 'read(fd, buf, count)'}
+
+# Layer zones drawn by the page (index_cinematic.html): y of the data shape and zone color
+LAYER_SLOTS = {
+    'user': {'y': 80, 'color': '#f093fb', 'shape': 'circle'},
+    'syscall': {'y': 150, 'color': '#4facfe', 'shape': 'bars'},
+    'vfs': {'y': 215, 'color': '#43e97b', 'shape': 'tree'},
+    'fs': {'y': 285, 'color': '#fa709a', 'shape': 'grid'},
+    'block': {'y': 355, 'color': '#fee140', 'shape': 'queue'},
+    'device': {'y': 425, 'color': '#30cfd0', 'shape': 'device'},
+}
+ANCHOR_X = 300
+
+NAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]*$')
+COLOR_PATTERN = re.compile(r'^#[0-9a-fA-F]{6}$')
+MAX_LABEL = 12
+TOOLTIP_FIELDS = ('title', 'desc', 'code')
+
+
+class SpecError(ValueError):
+    pass
+
+
+# ====================
+# SHAPES
+# ====================
+def translate(d, dx, dy):
+    """Absolute cubic `M C Z` form of path `d`, shifted by (dx, dy)"""
+    return format_subpaths([
+        [tuple((x + dx, y + dy) for x, y in seg) for seg in subpath]
+        for subpath in to_subpaths(d)
+    ])
+
+
+def shape_library(config_path=CONFIG_PATH):
+    """read()'s shapes as templates relative to their layer anchor"""
+    shapes, order = load_config(config_path)
+    library = {}
+    for layer, name in zip(LAYERS, order):
+        library[name] = translate(shapes[name], -ANCHOR_X, -LAYER_SLOTS[layer]['y'])
+    return library
+
+
+# ====================
+# VALIDATION
+# ====================
+def validate(spec, library, source='spec'):
+    """Raise SpecError with every problem found in one spec"""
+    problems = []
+    name = spec.get('name')
+    if not isinstance(name, str) or not NAME_PATTERN.match(name):
+        problems.append(f'name must match {NAME_PATTERN.pattern}, got {name!r}')
+    elif name == BUILTIN['name']:
+        problems.append(f'{name} is the hand-written built-in config')
+    if not isinstance(spec.get('number'), int) or spec['number'] < 0:
+        problems.append('number must be a non-negative syscall number')
+    if not isinstance(spec.get('signature'), str) or not spec['signature']:
+        problems.append('signature is required')
+
+    custom = spec.get('shapes', {})
+    for shape, d in custom.items():
+        if shape in library:
+            problems.append(f'custom shape {shape!r} shadows a library shape')
+        try:
+            if not to_subpaths(d):
+                problems.append(f'custom shape {shape!r} is empty')
+        except (ValueError, IndexError) as e:
+            problems.append(f'custom shape {shape!r} does not parse: {e}')
+
+    layers = spec.get('layers', {})
+    missing = [layer for layer in LAYERS if layer not in layers]
+    unknown = [layer for layer in layers if layer not in LAYERS]
+    if missing:
+        problems.append(f'missing layers: {missing}')
+    if unknown:
+        problems.append(f'unknown layers: {unknown} (expected {list(LAYERS)})')
+
+    for layer, entry in layers.items():
+        if layer not in LAYER_SLOTS:
+            continue
+        for field in ('label',) + TOOLTIP_FIELDS:
+            if not isinstance(entry.get(field), str) or not entry[field].strip():
+                problems.append(f'{layer}.{field} is required')
+        if len(entry.get('label', '')) > MAX_LABEL:
+            problems.append(f'{layer}.label longer than {MAX_LABEL} characters')
+        shape = entry.get('shape', LAYER_SLOTS[layer]['shape'])
+        if shape not in library and shape not in custom:
+            problems.append(f'{layer}.shape {shape!r} is not in the library or the spec')
+        if 'color' in entry and not COLOR_PATTERN.match(entry['color']):
+            problems.append(f'{layer}.color must be #rrggbb')
+
+    if problems:
+        raise SpecError(f'{source}: ' + '; '.join(problems))
+
+
+# ====================
+# GENERATION
+# ====================
+def build_config(spec, library):
+    """Placed shapes, layer table and morph paths for one validated spec"""
+    templates = dict(library)
+    templates.update((name, translate(d, 0, 0)) for name, d in spec.get('shapes', {}).items())
+
+    shapes, layers = {}, []
+    for layer in LAYERS:
+        entry, slot = spec['layers'][layer], LAYER_SLOTS[layer]
+        template = entry.get('shape', slot['shape'])
+        # Shapes are placed per layer, so a template reused on another layer gets its own key
+        key = template if template not in shapes or shapes[template][1] == layer else f'{template}_{layer}'
+        shapes[key] = (translate(templates[template], ANCHOR_X, slot['y']), layer)
+        layers.append({
+            'shape': key,
+            'color': entry.get('color', slot['color']),
+            'y': slot['y'],
+            'label': entry['label'],
+            'tooltip': {field: html.escape(entry[field], quote=False) for field in TOOLTIP_FIELDS},
+        })
+
+    shapes = {key: d for key, (d, _) in shapes.items()}
+    morph_paths = {}
+    for prev, current in zip(layers, layers[1:]):
+        key = f"{prev['shape']}->{current['shape']}"
+        if key not in morph_paths:
+            t = analyze_transition(shapes[prev['shape']], shapes[current['shape']])
+            morph_paths[key] = {'from': t['from'], 'to': t['to']}
+    return {'shapes': shapes, 'layers': layers, 'morph_paths': morph_paths}
+
+
+def render_config(spec, config, source):
+    title = f"{spec['name'].upper()} SYSCALL CONFIGURATION (generated)"
+    lines = [
+        '// ============================================',
+        f'// {title}',
+        '// ============================================',
+        f'// Generated by syscall_configs.py from {source} - do not edit by hand.',
+        '// Shapes are placed on their layer and normalized to cubics; morph paths',
+        '// are structure-matched for each adjacent transition.',
+        '',
+        'export const shapes = {',
+    ]
+    lines.extend(f'    {key}: {json.dumps(d)},' for key, d in config['shapes'].items())
+    lines[-1] = lines[-1].rstrip(',')
+    lines.append('};')
+    lines.append('')
+    lines.append('export const layers = ' + json.dumps(config['layers'], indent=4) + ';')
+    lines.append('')
+    lines.append('export const morphPaths = {')
+    for key, t in config['morph_paths'].items():
+        lines.append(f"    '{key}': {{")
+        lines.append(f"        from: {json.dumps(t['from'])},")
+        lines.append(f"        to: {json.dumps(t['to'])}")
+        lines.append('    },')
+    lines[-1] = '    }'
+    lines.append('};')
+    lines.append('')
+    lines.append(f"export const syscallName = '{spec['name']}';")
+    return '\n'.join(lines) + '\n'
+
+
+def render_catalog(specs):
+    """Startup module: the name list and one lazy loader per syscall"""
+    entries = [BUILTIN] + sorted(specs, key=lambda s: s['number'])
+    lines = [
+        '// ============================================',
+        '// SYSCALL CATALOG (generated)',
+        '// ============================================',
+        '// Generated by syscall_configs.py - do not edit by hand.',
+        '// Only names are loaded at startup; a config module is fetched the',
+        '// first time its syscall is selected.',
+        '',
+        'export const syscallCatalog = [',
+    ]
+    lines.extend(
+        f"    {{ name: '{s['name']}', number: {s['number']}, signature: {json.dumps(s['signature'])} }},"
+        for s in entries
+    )
+    lines[-1] = lines[-1].rstrip(',')
+    lines.append('];')
+    lines.append('')
+    lines.append('const loaders = {')
+    lines.append(f"    {BUILTIN['name']}: () => Promise.all([import('./read-config.js'), import('./read-morph-paths.js')])")
+    lines.append('        .then(([config, paths]) => ({ ...config, morphPaths: paths.morphPaths })),')
+    lines.extend(f"    {s['name']}: () => import('./{s['name']}-config.js')," for s in entries[1:])
+    lines[-1] = lines[-1].rstrip(',')
+    lines.append('};')
+    lines.append('')
+    lines.append('const loaded = new Map();')
+    lines.append('')
+    lines.append('export function loadSyscallConfig(name) {')
+    lines.append('    if (!loaders[name]) {')
+    lines.append('        return Promise.reject(new Error(`Unknown syscall \'${name}\'`));')
+    lines.append('    }')
+    lines.append('    if (!loaded.has(name)) {')
+    lines.append('        // Forget failed loads so the next selection retries the import')
+    lines.append('        loaded.set(name, loaders[name]().catch(err => {')
+    lines.append('            loaded.delete(name);')
+    lines.append('            throw err;')
+    lines.append('        }));')
+    lines.append('    }')
+    lines.append('    return loaded.get(name);')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def load_specs(spec_dir, library):
+    specs = []
+    for path in sorted(Path(spec_dir).glob('*.json')):
+        try:
+            spec = json.loads(path.read_text())
+        except json.JSONDecodeError as e:
+            raise SpecError(f'{path}: invalid JSON: {e}')
+        validate(spec, library, path.as_posix())
+        if spec['name'] != path.stem:
+            raise SpecError(f'{path}: file name must match name {spec["name"]!r}')
+        specs.append((path, spec))
+
+    numbers = [spec['number'] for _, spec in specs] + [BUILTIN['number']]
+    duplicates = sorted({n for n in numbers if numbers.count(n) > 1})
+    if duplicates:
+        raise SpecError(f'duplicate syscall numbers: {duplicates}')
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate syscall config modules from specs')
+    parser.add_argument('--specs', type=Path, default=SPEC_DIR)
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--check', action='store_true', help='Validate specs without writing modules')
+    args = parser.parse_args()
+
+    try:
+        library = shape_library()
+        specs = load_specs(args.specs, library)
+        print(f'✓ {len(specs)} specs valid ({", ".join(s["name"] for _, s in specs)})')
+        if args.check:
+            return 0
+
+        for path, spec in specs:
+            config = build_config(spec, library)
+            output = args.output / f'{spec["name"]}-config.js'
+            output.write_text(render_config(spec, config, path.as_posix()))
+            numbers = sum(d.count(',') for t in config['morph_paths'].values() for d in t.values())
+            print(f'  📦 {output} ({len(config["shapes"])} shapes, '
+                  f'{len(config["morph_paths"])} transitions, {numbers} points)')
+
+        catalog = args.output / CATALOG_NAME
+        catalog.write_text(render_catalog([spec for _, spec in specs]))
+        print(f'\n📚 Catalog written to: {catalog} ({catalog.stat().st_size} bytes)')
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except ValueError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,13 +4,35 @@ Kernel Lens Playwright Test
 Comprehensive testing and analysis of the kernel visualization
 """
 
+import argparse
 import asyncio
 import json
 import os
+import sqlite3
+import statistics
 from pathlib import Path
 from datetime import datetime
 from playwright.async_api import async_playwright
 
+from run_history import RunHistory
+from trace_spans import enable as enable_tracing, span, traced
+
+# Source modules served from the repo root vs. `python3 build_bundle.py --serve --port 8001`
+SOURCE_URL = 'http://localhost:8000/index_cinematic.html'
+BUNDLE_URL = 'http://localhost:8001/index_cinematic.html'
+
+# Records performance.now() at the first animation frame after the visualizer exists
+FIRST_FRAME_SCRIPT = '''(() => {
+    const tick = () => {
+        if (window.visualizer) {
+            requestAnimationFrame(() => { window.__firstFrame = performance.now(); });
+        } else {
+            requestAnimationFrame(tick);
+        }
+    };
+    requestAnimationFrame(tick);
+})();'''
+
 class KernelLensTest:
     def __init__(self):
         self.screenshot_dir = Path('./playwright-screenshots')
@@ -35,15 +57,26 @@ class KernelLensTest:
         if details:
             print(f"  Details: {details}")
 
+    def phase(self, title):
+        """Span covering one named test phase; use as `with self.phase(...):`"""
+        return span(title, cat='phase')
+
+    async def wait(self, seconds):
+        """Sleep while animations run; traced separately from screenshots"""
+        with span('wait', cat='wait', seconds=seconds):
+            await asyncio.sleep(seconds)
+
     async def screenshot(self, page, filename, description=''):
         """Take a screenshot"""
         path = self.screenshot_dir / filename
-        await page.screenshot(path=str(path), full_page=True)
+        with span('screenshot', cat='screenshot', file=filename):
+            await page.screenshot(path=str(path), full_page=True)
         self.results['screenshots'].append(filename)
         print(f"  📸 {filename}")
         if description:
             print(f"      {description}")
 
+    @traced(cat='test')
     async def run_tests(self):
         """Run all tests"""
         print('🚀 Starting Kernel Lens Playwright Test...\n')
@@ -63,211 +96,225 @@ class KernelLensTest:
 
                 # Test 1: Navigate to page
                 print('✅ Test 1: Page Navigation')
-                try:
-                    await page.goto('http://localhost:8000/index.html', timeout=10000)
-                    self.log_test('Page Navigation', True, 'Successfully loaded index.html')
-                except Exception as e:
-                    self.log_test('Page Navigation', False, str(e))
-                    raise
+                with self.phase('Test 1: Page Navigation'):
+                    try:
+                        with span('goto', cat='wait', url='index.html'):
+                            await page.goto('http://localhost:8000/index.html', timeout=10000)
+                        self.log_test('Page Navigation', True, 'Successfully loaded index.html')
+                    except Exception as e:
+                        self.log_test('Page Navigation', False, str(e))
+                        raise
 
                 # Test 2: Journey Mode
                 print('\n✅ Test 2: Journey Mode Initial State')
-                journey_visible = await page.locator('.journey-space').is_visible()
-                kernel_core_visible = await page.locator('.kernel-core').is_visible()
-                self.log_test('Journey Mode Visible',
-                             journey_visible and kernel_core_visible,
-                             f'Journey space: {journey_visible}, Kernel core: {kernel_core_visible}')
+                with self.phase('Test 2: Journey Mode Initial State'):
+                    journey_visible = await page.locator('.journey-space').is_visible()
+                    kernel_core_visible = await page.locator('.kernel-core').is_visible()
+                    self.log_test('Journey Mode Visible',
+                                 journey_visible and kernel_core_visible,
+                                 f'Journey space: {journey_visible}, Kernel core: {kernel_core_visible}')
 
-                await self.screenshot(page, '01-journey-mode.png', 'Initial journey mode view')
+                    await self.screenshot(page, '01-journey-mode.png', 'Initial journey mode view')
 
                 # Test 3: Enter Kernel Animation
                 print('\n✅ Test 3: Enter Kernel Animation')
-                await page.click('.kernel-core')
-                await asyncio.sleep(2)  # Wait for animation
+                with self.phase('Test 3: Enter Kernel Animation'):
+                    await page.click('.kernel-core')
+                    await self.wait(2)  # Wait for animation
 
-                main_viz_visible = await page.locator('#svg-morph').is_visible()
-                self.log_test('Main Visualization Appears',
-                             main_viz_visible,
-                             'SVG morphing visualization appeared after click')
+                    main_viz_visible = await page.locator('#svg-morph').is_visible()
+                    self.log_test('Main Visualization Appears',
+                                 main_viz_visible,
+                                 'SVG morphing visualization appeared after click')
 
-                await self.screenshot(page, '02-main-visualization.png', 'Main visualization after entry')
+                    await self.screenshot(page, '02-main-visualization.png', 'Main visualization after entry')
 
                 # Test 4: Morphing Animation
                 print('\n✅ Test 4: Shape Morphing Animation')
-                await asyncio.sleep(1)
+                with self.phase('Test 4: Shape Morphing Animation'):
+                    await self.wait(1)
 
-                initial_shape = await page.evaluate('''() => {
-                    return document.getElementById('data-shape').getAttribute('d');
-                }''')
+                    initial_shape = await page.evaluate('''() => {
+                        return document.getElementById('data-shape').getAttribute('d');
+                    }''')
 
-                await asyncio.sleep(3)  # Wait for morph
+                    await self.wait(3)  # Wait for morph
 
-                changed_shape = await page.evaluate('''() => {
-                    return document.getElementById('data-shape').getAttribute('d');
-                }''')
+                    changed_shape = await page.evaluate('''() => {
+                        return document.getElementById('data-shape').getAttribute('d');
+                    }''')
 
-                morphing_active = initial_shape != changed_shape
-                self.log_test('Shape Morphing Active',
-                             morphing_active,
-                             f'Shape changed: {morphing_active}')
+                    morphing_active = initial_shape != changed_shape
+                    self.log_test('Shape Morphing Active',
+                                 morphing_active,
+                                 f'Shape changed: {morphing_active}')
 
-                await self.screenshot(page, '03-morphing-active.png', 'Morphing in progress')
+                    await self.screenshot(page, '03-morphing-active.png', 'Morphing in progress')
 
                 # Test 5: Particle System
                 print('\n✅ Test 5: Particle Canvas System')
-                particle_stats = await page.evaluate('''() => {
-                    const canvas = document.getElementById('particle-canvas');
-                    return {
-                        exists: !!canvas,
-                        width: canvas ? canvas.width : 0,
-                        height: canvas ? canvas.height : 0,
-                        visible: canvas ? canvas.style.display !== 'none' : false
-                    };
-                }''')
-
-                self.log_test('Particle Canvas Active',
-                             particle_stats['exists'] and particle_stats['visible'],
-                             f"Canvas: {particle_stats['width']}x{particle_stats['height']}")
+                with self.phase('Test 5: Particle Canvas System'):
+                    particle_stats = await page.evaluate('''() => {
+                        const canvas = document.getElementById('particle-canvas');
+                        return {
+                            exists: !!canvas,
+                            width: canvas ? canvas.width : 0,
+                            height: canvas ? canvas.height : 0,
+                            visible: canvas ? canvas.style.display !== 'none' : false
+                        };
+                    }''')
+
+                    self.log_test('Particle Canvas Active',
+                                 particle_stats['exists'] and particle_stats['visible'],
+                                 f"Canvas: {particle_stats['width']}x{particle_stats['height']}")
 
                 # Test 6: Interactive Sliders
                 print('\n✅ Test 6: Interactive Parameter Controls')
+                with self.phase('Test 6: Interactive Parameter Controls'):
+                    # Test FD slider
+                    await page.fill('#fd-input', '7')
+                    fd_value = await page.text_content('#fd-value')
+                    fd_test = fd_value == '7'
+                    print(f"  FD Slider: {fd_value} {'✓' if fd_test else '✗'}")
 
-                # Test FD slider
-                await page.fill('#fd-input', '7')
-                fd_value = await page.text_content('#fd-value')
-                fd_test = fd_value == '7'
-                print(f"  FD Slider: {fd_value} {'✓' if fd_test else '✗'}")
-
-                await self.screenshot(page, '04-fd-slider.png', f'FD = {fd_value}')
+                    await self.screenshot(page, '04-fd-slider.png', f'FD = {fd_value}')
 
-                # Test Size slider
-                await page.fill('#size-input', '16384')
-                size_value = await page.text_content('#size-value')
-                size_test = size_value == '16384'
-                print(f"  Size Slider: {size_value} {'✓' if size_test else '✗'}")
+                    # Test Size slider
+                    await page.fill('#size-input', '16384')
+                    size_value = await page.text_content('#size-value')
+                    size_test = size_value == '16384'
+                    print(f"  Size Slider: {size_value} {'✓' if size_test else '✗'}")
 
-                await self.screenshot(page, '05-size-slider.png', f'Size = {size_value}')
+                    await self.screenshot(page, '05-size-slider.png', f'Size = {size_value}')
 
-                # Test Cache slider
-                await page.fill('#cache-input', '100')
-                cache_value = await page.text_content('#cache-value')
-                cache_test = cache_value.startswith('100')
-                print(f"  Cache Slider: {cache_value} {'✓' if cache_test else '✗'}")
+                    # Test Cache slider
+                    await page.fill('#cache-input', '100')
+                    cache_value = await page.text_content('#cache-value')
+                    cache_test = cache_value.startswith('100')
+                    print(f"  Cache Slider: {cache_value} {'✓' if cache_test else '✗'}")
 
-                self.log_test('Interactive Sliders',
-                             fd_test and size_test and cache_test,
-                             f'FD: {fd_value}, Size: {size_value}, Cache: {cache_value}')
+                    self.log_test('Interactive Sliders',
+                                 fd_test and size_test and cache_test,
+                                 f'FD: {fd_value}, Size: {size_value}, Cache: {cache_value}')
 
-                await self.screenshot(page, '06-cache-slider.png', f'Cache = {cache_value}')
+                    await self.screenshot(page, '06-cache-slider.png', f'Cache = {cache_value}')
 
                 # Test 7: Metrics Display
                 print('\n✅ Test 7: Real-time Metrics')
-                metrics = await page.evaluate('''() => {
-                    const time = document.querySelector('.metric:nth-child(1) .metric-value')?.textContent;
-                    const cache = document.querySelector('.metric:nth-child(2) .metric-value')?.textContent;
-                    const ops = document.querySelector('.metric:nth-child(3) .metric-value')?.textContent;
-                    const size = document.querySelector('.metric:nth-child(4) .metric-value')?.textContent;
+                with self.phase('Test 7: Real-time Metrics'):
+                    metrics = await page.evaluate('''() => {
+                        const time = document.querySelector('.metric:nth-child(1) .metric-value')?.textContent;
+                        const cache = document.querySelector('.metric:nth-child(2) .metric-value')?.textContent;
+                        const ops = document.querySelector('.metric:nth-child(3) .metric-value')?.textContent;
+                        const size = document.querySelector('.metric:nth-child(4) .metric-value')?.textContent;
 
-                    return { time, cache, ops, size };
-                }''')
+                        return { time, cache, ops, size };
+                    }''')
 
-                all_metrics_present = all(metrics.values())
-                self.log_test('Metrics Display',
-                             all_metrics_present,
-                             f"Time: {metrics['time']}, Cache: {metrics['cache']}, Ops: {metrics['ops']}, Size: {metrics['size']}")
+                    all_metrics_present = all(metrics.values())
+                    self.log_test('Metrics Display',
+                                 all_metrics_present,
+                                 f"Time: {metrics['time']}, Cache: {metrics['cache']}, Ops: {metrics['ops']}, Size: {metrics['size']}")
 
                 # Test 8: Layer Tooltips
                 print('\n✅ Test 8: Layer Hover Tooltips')
-                await page.hover('#layer-user')
-                await asyncio.sleep(0.5)
+                with self.phase('Test 8: Layer Hover Tooltips'):
+                    await page.hover('#layer-user')
+                    await self.wait(0.5)
 
-                tooltip_info = await page.evaluate('''() => {
-                    const tooltip = document.getElementById('layer-tooltip');
-                    return {
-                        visible: tooltip ? tooltip.classList.contains('show') : false,
-                        content: tooltip ? tooltip.textContent.substring(0, 100) : ''
-                    };
-                }''')
+                    tooltip_info = await page.evaluate('''() => {
+                        const tooltip = document.getElementById('layer-tooltip');
+                        return {
+                            visible: tooltip ? tooltip.classList.contains('show') : false,
+                            content: tooltip ? tooltip.textContent.substring(0, 100) : ''
+                        };
+                    }''')
 
-                self.log_test('Layer Tooltip',
-                             tooltip_info['visible'],
-                             f"Content preview: {tooltip_info['content'][:50]}...")
+                    self.log_test('Layer Tooltip',
+                                 tooltip_info['visible'],
+                                 f"Content preview: {tooltip_info['content'][:50]}...")
 
-                await self.screenshot(page, '07-tooltip.png', 'USER SPACE layer tooltip')
+                    await self.screenshot(page, '07-tooltip.png', 'USER SPACE layer tooltip')
 
                 # Test 9: Morphing Cycle Capture
                 print('\n✅ Test 9: Full Morphing Cycle')
-                print('  Capturing complete morphing sequence...')
+                with self.phase('Test 9: Full Morphing Cycle'):
+                    print('  Capturing complete morphing sequence...')
 
-                for i in range(6):
-                    await asyncio.sleep(2)
-                    await self.screenshot(page, f'08-morph-stage-{i+1}.png',
-                                        f'Morph stage {i+1}/6')
+                    for i in range(6):
+                        await self.wait(2)
+                        await self.screenshot(page, f'08-morph-stage-{i+1}.png',
+                                            f'Morph stage {i+1}/6')
 
-                self.log_test('Full Morphing Cycle',
-                             True,
-                             'Captured all 6 morphing stages')
+                    self.log_test('Full Morphing Cycle',
+                                 True,
+                                 'Captured all 6 morphing stages')
 
                 # Test 10: Performance Metrics
                 print('\n✅ Test 10: Performance Analysis')
-                perf_metrics = await page.evaluate('''() => {
-                    return new Promise((resolve) => {
-                        let frameCount = 0;
-                        const startTime = performance.now();
-
-                        function countFrames() {
-                            frameCount++;
-                            if (frameCount < 60) {
-                                requestAnimationFrame(countFrames);
-                            } else {
-                                const endTime = performance.now();
-                                const duration = (endTime - startTime) / 1000;
-                                const fps = frameCount / duration;
-
-                                resolve({
-                                    fps: Math.round(fps),
-                                    memory: performance.memory ? {
-                                        used: Math.round(performance.memory.usedJSHeapSize / 1024 / 1024),
-                                        total: Math.round(performance.memory.totalJSHeapSize / 1024 / 1024)
-                                    } : null
-                                });
+                with self.phase('Test 10: Performance Analysis'):
+                    perf_metrics = await page.evaluate('''() => {
+                        return new Promise((resolve) => {
+                            let frameCount = 0;
+                            const startTime = performance.now();
+
+                            function countFrames() {
+                                frameCount++;
+                                if (frameCount < 60) {
+                                    requestAnimationFrame(countFrames);
+                                } else {
+                                    const endTime = performance.now();
+                                    const duration = (endTime - startTime) / 1000;
+                                    const fps = frameCount / duration;
+
+                                    resolve({
+                                        fps: Math.round(fps),
+                                        memory: performance.memory ? {
+                                            used: Math.round(performance.memory.usedJSHeapSize / 1024 / 1024),
+                                            total: Math.round(performance.memory.totalJSHeapSize / 1024 / 1024)
+                                        } : null
+                                    });
+                                }
                             }
-                        }
 
-                        requestAnimationFrame(countFrames);
-                    });
-                }''')
+                            requestAnimationFrame(countFrames);
+                        });
+                    }''')
 
-                fps_good = perf_metrics['fps'] >= 30
-                self.log_test('Performance',
-                             fps_good,
-                             f"FPS: {perf_metrics['fps']} {'(Good)' if fps_good else '(Poor)'}")
+                    self.results['performance'] = perf_metrics
+                    fps_good = perf_metrics['fps'] >= 30
+                    self.log_test('Performance',
+                                 fps_good,
+                                 f"FPS: {perf_metrics['fps']} {'(Good)' if fps_good else '(Poor)'}")
 
-                if perf_metrics['memory']:
-                    print(f"  Memory: {perf_metrics['memory']['used']}MB / {perf_metrics['memory']['total']}MB")
+                    if perf_metrics['memory']:
+                        print(f"  Memory: {perf_metrics['memory']['used']}MB / {perf_metrics['memory']['total']}MB")
 
                 # Test 11: GSAP Library
                 print('\n✅ Test 11: Dependencies Check')
-                gsap_loaded = await page.evaluate('''() => {
-                    return typeof gsap !== 'undefined' && typeof gsap.to === 'function';
-                }''')
+                with self.phase('Test 11: Dependencies Check'):
+                    gsap_loaded = await page.evaluate('''() => {
+                        return typeof gsap !== 'undefined' && typeof gsap.to === 'function';
+                    }''')
 
-                self.log_test('GSAP Library Loaded',
-                             gsap_loaded,
-                             'GSAP animation library fully functional')
+                    self.log_test('GSAP Library Loaded',
+                                 gsap_loaded,
+                                 'GSAP animation library fully functional')
 
                 # Test 12: All Layer Elements Present
                 print('\n✅ Test 12: Complete Layer Structure')
-                layer_count = await page.evaluate('''() => {
-                    return document.querySelectorAll('[id^="layer-"]').length;
-                }''')
+                with self.phase('Test 12: Complete Layer Structure'):
+                    layer_count = await page.evaluate('''() => {
+                        return document.querySelectorAll('[id^="layer-"]').length;
+                    }''')
 
-                self.log_test('All Layers Present',
-                             layer_count >= 6,
-                             f'{layer_count} kernel layers detected')
+                    self.log_test('All Layers Present',
+                                 layer_count >= 6,
+                                 f'{layer_count} kernel layers detected')
 
                 # Final screenshot
-                await self.screenshot(page, '09-final-state.png', 'Final visualization state')
+                with self.phase('Final State'):
+                    await self.screenshot(page, '09-final-state.png', 'Final visualization state')
 
                 await browser.close()
 
@@ -284,6 +331,61 @@ class KernelLensTest:
                 except:
                     pass
 
+    async def measure_first_frame(self, browser, url, runs):
+        """Cold-load a page `runs` times and return time-to-first-frame samples (ms)"""
+        samples = []
+        for _ in range(runs):
+            # Fresh context per run so nothing is served from the HTTP cache
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+            await context.add_init_script(FIRST_FRAME_SCRIPT)
+            page = await context.new_page()
+            try:
+                with span('goto', cat='wait', url=url):
+                    await page.goto(url, timeout=10000)
+                with span('first frame', cat='wait', url=url):
+                    await page.wait_for_function('window.__firstFrame !== undefined', timeout=10000)
+                samples.append(await page.evaluate('window.__firstFrame'))
+            finally:
+                await context.close()
+        return samples
+
+    @traced(cat='test')
+    async def compare_first_frame(self, runs=5, source_url=SOURCE_URL, bundle_url=BUNDLE_URL):
+        """Compare time-to-first-frame of the source modules vs. the built bundle"""
+        print('⏱️  Time-to-First-Frame: source modules vs. bundle\n')
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(
+                headless=True,
+                args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
+            )
+            try:
+                comparison = {}
+                for label, url in (('source', source_url), ('bundle', bundle_url)):
+                    samples = await self.measure_first_frame(browser, url, runs)
+                    comparison[label] = {
+                        'url': url,
+                        'samples_ms': [round(s, 1) for s in samples],
+                        'median_ms': round(statistics.median(samples), 1)
+                    }
+                    print(f"  {label:7} median {comparison[label]['median_ms']}ms  {comparison[label]['samples_ms']}")
+
+                delta = comparison['source']['median_ms'] - comparison['bundle']['median_ms']
+                comparison['improvement_ms'] = round(delta, 1)
+                self.results['first_frame'] = comparison
+                self.log_test('Bundle Time-to-First-Frame',
+                             delta >= 0,
+                             f"Bundle is {delta:.1f}ms {'faster' if delta >= 0 else 'slower'} (median of {runs})")
+
+            except Exception as e:
+                print(f'\n❌ Error during first-frame comparison: {e}')
+                self.results['errors'].append({
+                    'message': str(e),
+                    'type': type(e).__name__
+                })
+            finally:
+                await browser.close()
+
     def print_summary(self):
         """Print test summary"""
         print('\n' + '=' * 60)
@@ -328,6 +430,12 @@ class KernelLensTest:
             json.dump(self.results, f, indent=2)
         print(f'\n📄 Full report saved to: {report_path}')
 
+        try:
+            with RunHistory() as history:
+                history.record_report('playwright', self.results)
+        except sqlite3.Error as e:
+            print(f'⚠️  Could not record run history: {e}')
+
         print('\n' + '=' * 60)
         if pass_rate == 100.0:
             print('🎉 ALL TESTS PASSED!')
@@ -338,8 +446,22 @@ class KernelLensTest:
         return passed == total
 
 async def main():
+    parser = argparse.ArgumentParser(description='Kernel Lens Playwright test')
+    parser.add_argument('--first-frame', action='store_true',
+                        help='Compare time-to-first-frame of source modules vs. the dist/ bundle')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write phase/wait/screenshot spans (Chrome trace JSON, or UTF for .jsonl)')
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_tracing(args.trace)
+
     tester = KernelLensTest()
-    await tester.run_tests()
+    if args.first_frame:
+        await tester.compare_first_frame(runs=args.runs)
+    else:
+        await tester.run_tests()
     success = tester.print_summary()
     return 0 if success else 1
 
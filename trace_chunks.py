@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Chunked Trace Container
+Streams UTF events into fixed-size, time-ordered chunks with a footer
+index, and serves trace files over HTTP with Range support so the viewer
+can fetch only the chunks overlapping the visible time window.
+
+File layout:
+    HEADER  | CHUNK 0 | CHUNK 1 | ... | FOOTER (JSON) | TRAILER
+
+Each chunk holds up to `chunk_events` packed RECORD structs (see
+trace_index.py). The footer lists every chunk's offset, byte length,
+event count and [t_start, t_end] range plus the string tables. The
+trailer is a fixed 16 bytes, so a client reads `Range: bytes=-16`
+first, then the footer, then only the chunks it needs.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import struct
+import sys
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from trace_index import LAYERS, RECORD, record_event, record_fields
+
+MAGIC = b'KLTRACE\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHH4x')     # magic, version, record size
+TRAILER = struct.Struct('<QI4s')      # footer offset, footer length, end magic
+END_MAGIC = b'KLT1'
+
+DEFAULT_CHUNK_EVENTS = 16384          # 512 KB per chunk at 32-byte records
+
+
+class ChunkedTraceWriter:
+    """Streaming writer: holds at most one chunk of events in memory"""
+
+    def __init__(self, path, chunk_events=DEFAULT_CHUNK_EVENTS):
+        if chunk_events < 1:
+            raise ValueError('chunk_events must be positive')
+        self.path = Path(path)
+        self.chunk_events = chunk_events
+        self.file = open(self.path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+        self.buffer = bytearray(RECORD.size * chunk_events)
+        self.buffered = 0
+        self.chunk_start = None
+        self.last_timestamp = None
+
+        self.syscall_names = []
+        self.syscall_ids = {}
+        self.chunks = []
+        self.events = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_event(self, event):
+        """Append one UTF event dict; events must arrive in timestamp order"""
+        fields = record_fields(event, self.syscall_names, self.syscall_ids)
+        timestamp = fields[0]
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(
+                f'Events must be time-ordered: {timestamp} after {self.last_timestamp}'
+            )
+
+        RECORD.pack_into(self.buffer, self.buffered * RECORD.size, *fields)
+
+        if self.buffered == 0:
+            self.chunk_start = timestamp
+        self.buffered += 1
+        self.events += 1
+        self.last_timestamp = timestamp
+
+        if self.buffered == self.chunk_events:
+            self._flush_chunk()
+
+    def _flush_chunk(self):
+        if not self.buffered:
+            return
+        offset = self.file.tell()
+        length = self.buffered * RECORD.size
+        self.file.write(memoryview(self.buffer)[:length])
+        self.chunks.append([offset, length, self.buffered, self.chunk_start, self.last_timestamp])
+        self.buffered = 0
+
+    def close(self):
+        """Flush the last partial chunk and write footer + trailer"""
+        if self.file.closed:
+            return
+        self._flush_chunk()
+
+        footer = json.dumps({
+            'version': VERSION,
+            'record_format': RECORD.format,
+            'record_size': RECORD.size,
+            'fields': ['timestamp', 'duration', 'pid', 'tid', 'cpu', 'syscall', 'layer'],
+            'chunk_events': self.chunk_events,
+            'events': self.events,
+            'syscalls': self.syscall_names,
+            'layers': LAYERS,
+            # [offset, length, count, t_start, t_end]
+            'chunks': self.chunks,
+        }, separators=(',', ':')).encode('utf-8')
+
+        footer_offset = self.file.tell()
+        self.file.write(footer)
+        self.file.write(TRAILER.pack(footer_offset, len(footer), END_MAGIC))
+        self.file.close()
+
+    def abort(self):
+        """Close without a footer and remove the partial file"""
+        if self.file.closed:
+            return
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class ChunkedTraceReader:
+    """Random-access reader that only touches the chunks it is asked for"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, 'rb')
+
+        magic, version, record_size = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f'{self.path} is not a Kernel Lens chunked trace')
+        if version != VERSION or record_size != RECORD.size:
+            raise ValueError(f'Unsupported trace version {version} / record size {record_size}')
+
+        self.file.seek(-TRAILER.size, os.SEEK_END)
+        footer_offset, footer_length, end_magic = TRAILER.unpack(self.file.read(TRAILER.size))
+        if end_magic != END_MAGIC:
+            raise ValueError(f'{self.path} is truncated (missing trailer)')
+
+        self.file.seek(footer_offset)
+        self.footer = json.loads(self.file.read(footer_length))
+        self.chunks = self.footer['chunks']
+        self._chunk_ends = [c[4] for c in self.chunks]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def chunks_overlapping(self, t_start, t_end):
+        """Indices of chunks whose time range intersects [t_start, t_end]"""
+        first = bisect.bisect_left(self._chunk_ends, t_start)
+        result = []
+        for i in range(first, len(self.chunks)):
+            if self.chunks[i][3] > t_end:
+                break
+            result.append(i)
+        return result
+
+    def read_chunk(self, i):
+        """Decode one chunk into UTF event dicts"""
+        offset, length, count, _, _ = self.chunks[i]
+        self.file.seek(offset)
+        data = self.file.read(length)
+        syscalls = self.footer['syscalls']
+        return [record_event(fields, syscalls) for fields in RECORD.iter_unpack(data)]
+
+    def events_between(self, t_start, t_end):
+        """Yield events with t_start <= timestamp_ns <= t_end"""
+        for i in self.chunks_overlapping(t_start, t_end):
+            for event in self.read_chunk(i):
+                if t_start <= event['timestamp_ns'] <= t_end:
+                    yield event
+
+
+def write_from_utf(source, destination, chunk_events=DEFAULT_CHUNK_EVENTS):
+    """Convert a time-ordered UTF JSON-lines file without loading it whole"""
+    with open(source) as f, ChunkedTraceWriter(destination, chunk_events) as writer:
+        for line in f:
+            line = line.strip()
+            if line:
+                writer.write_event(json.loads(line))
+    return writer
+
+
+# ====================
+# HTTP RANGE SERVER
+# ====================
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(ValueError):
+    """A single well-formed byte range that lies outside the file"""
+
+
+def parse_range(header, size):
+    """Resolve a single 'bytes=a-b' range to (start, end) inclusive
+
+    Returns None for headers the server ignores and answers with the full
+    body (multiple ranges, other units, malformed or reversed ranges), and
+    raises RangeNotSatisfiable for a single range past the end of the file.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+
+    first, last = match.group(1), match.group(2)
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that honors single-range HTTP Range requests"""
+
+    _range_remaining = None
+
+    def end_headers(self):
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'Content-Range, Content-Length')
+        super().end_headers()
+
+    def send_head(self):
+        range_header = self.headers.get('Range')
+        path = self.translate_path(self.path)
+        if not range_header or os.path.isdir(path):
+            return super().send_head()
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+
+        size = os.fstat(f.fileno()).st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            f.close()
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        if byte_range is None:
+            # Unsupported or malformed Range headers are ignored: full body, 200
+            f.close()
+            return super().send_head()
+
+        start, end = byte_range
+        self.send_response(206)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+
+        f.seek(start)
+        self._range_remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        remaining = self._range_remaining
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+
+        self._range_remaining = None
+        while remaining > 0:
+            block = source.read(min(64 * 1024, remaining))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+
+
+def serve(directory='.', host='127.0.0.1', port=8000):
+    """Serve a directory with Range support (drop-in for `python3 -m http.server`)"""
+    handler = partial(RangeRequestHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f'🌐 Serving {directory} with Range support on http://{host}:{port}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked Kernel Lens trace files')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    write = sub.add_parser('write', help='Convert a time-ordered UTF trace to the chunked format')
+    write.add_argument('source', type=Path)
+    write.add_argument('destination', type=Path)
+    write.add_argument('--chunk-events', type=int, default=DEFAULT_CHUNK_EVENTS)
+
+    info = sub.add_parser('info', help='Print the footer index of a chunked trace')
+    info.add_argument('trace', type=Path)
+
+    srv = sub.add_parser('serve', help='Serve a directory with HTTP Range support')
+    srv.add_argument('directory', type=Path, nargs='?', default=Path('.'))
+    srv.add_argument('--port', type=int, default=8000)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'write':
+            writer = write_from_utf(args.source, args.destination, args.chunk_events)
+            print(f'📦 Wrote {writer.events} events in {len(writer.chunks)} chunks to {args.destination}')
+        elif args.command == 'info':
+            with ChunkedTraceReader(args.trace) as reader:
+                print(f'📦 {reader.footer["events"]} events, {len(reader.chunks)} chunks')
+                for i, (offset, length, count, t0, t1) in enumerate(reader.chunks):
+                    print(f'  [{i}] offset={offset} bytes={length} events={count} t=[{t0}, {t1}]')
+        else:
+            serve(args.directory, port=args.port)
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except ValueError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
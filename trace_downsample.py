@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Trace Downsampler
+Streaming, tail-preserving stratified reduction for oversized traces.
+
+Events are stratified by (syscall, layer). Within each stratum:
+  - events above a running high percentile of duration (the tail) are
+    always kept, with weight 1;
+  - every other event competes for a uniform reservoir (Algorithm R).
+    At the end the reservoir is thinned to the target ratio and each
+    survivor carries weight = body events seen / body events kept.
+The first `warmup` events of a stratum (at most its reservoir capacity)
+are held back until its percentile is meaningful, then classified like
+every later event.
+
+Everything held in memory is a packed RECORD counted against the memory
+budget: reservoirs and warm-up events share most of it, and tail events
+fill a buffer that is spilled to disk as sorted runs when full. The
+output is a streamed merge of the runs and the reservoirs, in timestamp
+order.
+
+Weights are written to `metadata.sample_weight`, so weighted sums over
+the reduced trace (stage totals, histograms) are unbiased estimates of
+the same sums over the full trace.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+from trace_chunks import ChunkedTraceReader
+from trace_index import LAYERS, RECORD, event_fields, record_event, record_fields
+
+# Rough resident cost of one reservoir slot: packed record + bytes header + list slot
+EVENT_BYTES = RECORD.size + 33 + 8
+
+# Share of the memory budget buffering tail events between spills
+TAIL_SHARE = 1 / 8
+RUN_READ_RECORDS = 4096
+
+# Log-scale duration histogram: 8 buckets per power of two (~9% resolution)
+BUCKETS_PER_OCTAVE = 8
+THRESHOLD_REFRESH = 256
+
+
+def bucket_of(duration):
+    return int(math.log2(duration + 1) * BUCKETS_PER_OCTAVE)
+
+
+def bucket_floor(bucket):
+    return int(2 ** (bucket / BUCKETS_PER_OCTAVE)) - 1
+
+
+def record_timestamp(record):
+    return RECORD.unpack_from(record)[0]
+
+
+def weighted(records, weight):
+    """Stream (fields, weight) pairs from in-memory records"""
+    for record in records:
+        yield RECORD.unpack(record), weight
+
+
+def read_run(run, weight=1.0):
+    """Stream (fields, weight) pairs back from a spilled run of sorted records"""
+    run.seek(0)
+    while True:
+        data = run.read(RECORD.size * RUN_READ_RECORDS)
+        if not data:
+            return
+        for fields in RECORD.iter_unpack(data):
+            yield fields, weight
+
+
+class Stratum:
+    """Per-(syscall, layer) reservoir plus a running duration percentile"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.reservoir = []
+        self.pending = []      # warm-up records, classified once a threshold exists
+        self.seen = 0          # all events
+        self.body_seen = 0     # events that competed for the reservoir
+        self.tail_kept = 0
+        self.histogram = defaultdict(int)
+        self.threshold = None
+
+    def refresh_threshold(self, percentile):
+        rank = self.seen * percentile / 100
+        cumulative = 0
+        for bucket in sorted(self.histogram):
+            cumulative += self.histogram[bucket]
+            if cumulative >= rank:
+                # Lower edge of the bucket: errs on keeping slightly more tail
+                self.threshold = bucket_floor(bucket)
+                return
+
+    def shrink(self, capacity, rng):
+        """Uniformly thin the reservoir; it stays a uniform sample of the body"""
+        self.capacity = capacity
+        if len(self.reservoir) > capacity:
+            self.reservoir = rng.sample(self.reservoir, capacity)
+
+
+class StratifiedDownsampler:
+    def __init__(self, ratio=0.01, memory_mb=64, percentile=99.0, min_per_stratum=64,
+                 warmup=1000, seed=None):
+        if not 0 < ratio <= 1:
+            raise ValueError('ratio must be in (0, 1]')
+        if not 0 < percentile < 100:
+            raise ValueError('percentile must be in (0, 100)')
+        self.ratio = ratio
+        self.percentile = percentile
+        self.min_per_stratum = min_per_stratum
+        self.warmup = warmup
+        slots = int(memory_mb * 1024 * 1024 // EVENT_BYTES)
+        self.tail_capacity = max(min_per_stratum, int(slots * TAIL_SHARE))
+        self.budget = max(min_per_stratum, slots - self.tail_capacity)
+        self.rng = random.Random(seed)
+
+        self.strata = {}
+        self.syscall_names = []
+        self.syscall_ids = {}
+
+        # Tail records not yet spilled, and spilled runs (temporary files)
+        self.tail = []
+        self.runs = []
+
+        # Exact totals, kept only for reporting how close the estimates are
+        self.exact = defaultdict(lambda: [0, 0])
+
+    def _stratum(self, key):
+        stratum = self.strata.get(key)
+        if stratum is None:
+            capacity = self.budget // (len(self.strata) + 1)
+            if capacity < self.min_per_stratum:
+                raise MemoryError(
+                    f'Memory budget too small for {len(self.strata) + 1} strata '
+                    f'× {self.min_per_stratum} events'
+                )
+            # Re-split the budget so all reservoirs together stay within it
+            for other in self.strata.values():
+                other.shrink(capacity, self.rng)
+                if len(other.pending) > capacity:
+                    self._release(other)
+            stratum = self.strata[key] = Stratum(capacity)
+        return stratum
+
+    def add(self, event):
+        """Consume one UTF event"""
+        fields = record_fields(event, self.syscall_names, self.syscall_ids)
+        _, duration, _, _, _, sid, layer_id = fields
+        key = (self.syscall_names[sid], layer_id)
+
+        totals = self.exact[key]
+        totals[0] += 1
+        totals[1] += duration
+
+        stratum = self._stratum(key)
+        stratum.seen += 1
+        stratum.histogram[bucket_of(duration)] += 1
+
+        record = RECORD.pack(*fields)
+        if stratum.threshold is None:
+            # Hold warm-up records until the percentile is meaningful,
+            # or until they would outgrow the stratum's share of the budget
+            stratum.pending.append(record)
+            if stratum.seen >= self.warmup or len(stratum.pending) >= stratum.capacity:
+                self._release(stratum)
+            return
+
+        if stratum.seen % THRESHOLD_REFRESH == 0:
+            stratum.refresh_threshold(self.percentile)
+        self._classify(stratum, record, duration)
+
+    def _release(self, stratum):
+        stratum.refresh_threshold(self.percentile)
+        pending, stratum.pending = stratum.pending, []
+        for record in pending:
+            self._classify(stratum, record, RECORD.unpack_from(record)[1])
+
+    def _classify(self, stratum, record, duration):
+        if duration > stratum.threshold:
+            stratum.tail_kept += 1
+            self.tail.append(record)
+            if len(self.tail) >= self.tail_capacity:
+                self._spill()
+            return
+
+        # Algorithm R over the body of this stratum
+        stratum.body_seen += 1
+        if len(stratum.reservoir) < stratum.capacity:
+            stratum.reservoir.append(record)
+        else:
+            slot = self.rng.randrange(stratum.body_seen)
+            if slot < stratum.capacity:
+                stratum.reservoir[slot] = record
+
+    def _spill(self):
+        """Write the tail buffer to disk as one sorted run"""
+        self.tail.sort(key=record_timestamp)
+        run = tempfile.TemporaryFile()
+        run.write(b''.join(self.tail))
+        self.runs.append(run)
+        self.tail = []
+
+    def finish(self):
+        """Yield every kept event with its weight in metadata, in timestamp order"""
+        streams = []
+        for stratum in self.strata.values():
+            if stratum.pending:
+                self._release(stratum)
+            if not stratum.body_seen:
+                continue
+            target = max(self.min_per_stratum, math.ceil(stratum.body_seen * self.ratio))
+            if len(stratum.reservoir) > target:
+                stratum.reservoir = self.rng.sample(stratum.reservoir, target)
+            stratum.reservoir.sort(key=record_timestamp)
+            weight = stratum.body_seen / len(stratum.reservoir)
+            streams.append(weighted(stratum.reservoir, weight))
+
+        self.tail.sort(key=record_timestamp)
+        streams.append(weighted(self.tail, 1.0))
+        streams.extend(read_run(run) for run in self.runs)
+
+        try:
+            for fields, weight in heapq.merge(*streams):
+                yield record_event(fields, self.syscall_names, sample_weight=weight)
+        finally:
+            for run in self.runs:
+                run.close()
+            self.runs = []
+            self.tail = []
+            for stratum in self.strata.values():
+                stratum.reservoir = []
+
+    def reduce(self, events):
+        """Run the whole stage; yields weighted events sorted by timestamp"""
+        for event in events:
+            self.add(event)
+        yield from self.finish()
+
+
+def weighted_totals(events):
+    """Estimated (count, total duration) per (syscall, layer) from a weighted trace"""
+    totals = defaultdict(lambda: [0.0, 0.0])
+    for event in events:
+        metadata = event.get('metadata') or {}
+        weight = metadata.get('sample_weight', 1.0)
+        _, duration, _, _, _, syscall, layer = event_fields(event)
+        key = (syscall, layer)
+        totals[key][0] += weight
+        totals[key][1] += weight * duration
+    return totals
+
+
+def read_events(path):
+    """Stream UTF events from a JSON-lines or chunked (.kltc) trace"""
+    path = Path(path)
+    if path.suffix == '.kltc':
+        with ChunkedTraceReader(path) as reader:
+            for i in range(len(reader.chunks)):
+                yield from reader.read_chunk(i)
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tail-preserving stratified trace downsampling')
+    parser.add_argument('source', type=Path, help='UTF JSON-lines or .kltc trace')
+    parser.add_argument('destination', type=Path, help='Reduced UTF JSON-lines trace')
+    parser.add_argument('--ratio', type=float, default=0.01, help='Target fraction of body events kept')
+    parser.add_argument('--memory-mb', type=float, default=64, help='Reservoir memory budget')
+    parser.add_argument('--percentile', type=float, default=99.0, help='Always keep events above this')
+    parser.add_argument('--min-per-stratum', type=int, default=64)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    try:
+        sampler = StratifiedDownsampler(args.ratio, args.memory_mb, args.percentile,
+                                        args.min_per_stratum, seed=args.seed)
+        kept = 0
+        with open(args.destination, 'w') as f:
+            for event in sampler.reduce(read_events(args.source)):
+                f.write(json.dumps(event) + '\n')
+                kept += 1
+
+        total = sum(count for count, _ in sampler.exact.values())
+        tail = sum(s.tail_kept for s in sampler.strata.values())
+        print(f'✂️  {total} → {kept} events ({kept / max(total, 1):.2%}), '
+              f'{tail} tail events kept, {len(sampler.strata)} strata')
+
+        print('\n📊 Stage totals (exact vs weighted estimate):')
+        estimates = weighted_totals(read_events(args.destination))
+        for (syscall, layer), (count, duration) in sorted(sampler.exact.items()):
+            est_count, est_duration = estimates[(syscall, layer)]
+            error = abs(est_duration - duration) / duration * 100 if duration else 0.0
+            print(f'  {syscall:10} {LAYERS[layer]:8} count {count} ≈ {est_count:.0f}, '
+                  f'duration {duration / 1e6:.1f}ms ≈ {est_duration / 1e6:.1f}ms ({error:.1f}% off)')
+
+        print(f'\n📄 Reduced trace saved to: {args.destination}')
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except (ValueError, MemoryError) as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
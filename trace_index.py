@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Trace Index
+Ingests Universal Trace Format (UTF) events into columnar arrays with
+secondary indexes over pid/tid/cpu/syscall/layer, and serves filtered,
+paginated query results over a local HTTP endpoint.
+"""
+
+import argparse
+import json
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Layer ids match the `layer-<id>` groups in index.html
+LAYERS = ['user', 'syscall', 'vfs', 'fs', 'block', 'device']
+
+# Binary event record: timestamp_ns, duration_ns, pid, tid, cpu, syscall id, layer id
+RECORD = struct.Struct('<QQIIHHB3x')
+RECORD_FIELDS = ('timestamp', 'duration', 'pid', 'tid', 'cpu', 'syscall', 'layer')
+
+INDEXED_FIELDS = ('pid', 'tid', 'cpu', 'syscall', 'layer')
+
+# Merged unions and duration ranges kept for repeated queries
+CACHE_ENTRIES = 64
+
+DURATION_UNITS = {'ns': 1, 'us': 1_000, 'μs': 1_000, 'ms': 1_000_000, 's': 1_000_000_000}
+
+CLAUSE_PATTERNS = [
+    (re.compile(r'^(\w+)\s+in\s+\{([^}]*)\}$', re.IGNORECASE), 'in'),
+    (re.compile(r'^(\w+)\s*(>=|<=|>|<)\s*(\S+)$'), 'range'),
+    (re.compile(r'^(\w+)\s*==?\s*(\S+)$'), 'eq'),
+]
+
+
+class QueryError(ValueError):
+    """Raised for malformed or unsupported query expressions"""
+
+
+def parse_duration(text):
+    """Parse '1ms', '250us', '15000' (ns) into nanoseconds"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*(ns|us|μs|ms|s)?', text.strip())
+    if not match:
+        raise QueryError(f'Invalid duration: {text!r}')
+    return int(float(match.group(1)) * DURATION_UNITS[match.group(2) or 'ns'])
+
+
+def parse_query(text):
+    """Parse 'pid=1337 AND cpu in {2,3} AND duration > 1ms' into filter kwargs"""
+    filters = {}
+    if not text or not text.strip():
+        return filters
+
+    for clause in re.split(r'\s+AND\s+', text.strip(), flags=re.IGNORECASE):
+        clause = clause.strip()
+        for pattern, kind in CLAUSE_PATTERNS:
+            match = pattern.match(clause)
+            if match:
+                break
+        else:
+            raise QueryError(f'Cannot parse clause: {clause!r}')
+
+        field = match.group(1).lower()
+        if kind == 'range':
+            if field != 'duration':
+                raise QueryError(f'Range comparisons are only supported on duration, not {field!r}')
+            op, value = match.group(2), parse_duration(match.group(3))
+            if op == '>':
+                filters['min_duration_ns'] = value + 1
+            elif op == '>=':
+                filters['min_duration_ns'] = value
+            elif op == '<':
+                filters['max_duration_ns'] = value - 1
+            else:
+                filters['max_duration_ns'] = value
+            continue
+
+        if field not in INDEXED_FIELDS:
+            raise QueryError(f'Unknown field {field!r} (expected one of {", ".join(INDEXED_FIELDS)})')
+
+        if kind == 'in':
+            values = [v.strip() for v in match.group(2).split(',') if v.strip()]
+        else:
+            values = [match.group(2)]
+        filters[field] = values
+
+    return filters
+
+
+def normalize_syscall(name):
+    """Strip tracepoint prefixes: 'sys_read' / 'sys_enter_read' -> 'read'"""
+    for prefix in ('sys_enter_', 'sys_exit_', '__x64_sys_', 'sys_'):
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def layer_index(layer):
+    """Layer id from a name ('vfs') or an integer id (2 / '2')"""
+    if isinstance(layer, str) and not layer.isdigit():
+        if layer not in LAYERS:
+            raise ValueError(f'Unknown layer {layer!r} (expected one of {", ".join(LAYERS)})')
+        return LAYERS.index(layer)
+    layer_id = int(layer)
+    if not 0 <= layer_id < len(LAYERS):
+        raise ValueError(f'Layer id {layer_id} out of range 0-{len(LAYERS) - 1}')
+    return layer_id
+
+
+def _bounded(field, value, bits):
+    """Non-negative integer that fits the RECORD field, else ValueError"""
+    number = int(value)
+    if not 0 <= number < 1 << bits:
+        raise ValueError(f'{field} {number} out of range for a {bits}-bit field')
+    return number
+
+
+def event_fields(event):
+    """(timestamp_ns, duration_ns, pid, tid, cpu, syscall, layer_id) of one UTF event
+
+    Reads the field names documented in ARCHITECTURE.md (timestamp_ns,
+    syscall.name, metadata.layer, metrics.duration_ns) and falls back to
+    the flat short names (timestamp, name, layer, metadata.duration_ns).
+    """
+    metadata = event.get('metadata') or {}
+    metrics = event.get('metrics') or {}
+
+    timestamp = event.get('timestamp_ns', event.get('timestamp'))
+    if timestamp is None:
+        raise ValueError(f'Event has no timestamp_ns: {event.get("id", event)!r}')
+
+    syscall = event.get('syscall')
+    name = syscall.get('name') if isinstance(syscall, dict) else event.get('name')
+    duration = metrics.get('duration_ns', metadata.get('duration_ns', event.get('duration_ns', 0)))
+    pid = event.get('pid', 0)
+
+    return (
+        _bounded('timestamp_ns', timestamp, 64),
+        _bounded('duration_ns', duration, 64),
+        _bounded('pid', pid, 32),
+        _bounded('tid', event.get('tid', pid), 32),
+        _bounded('cpu', event.get('cpu', 0), 16),
+        normalize_syscall(name or 'unknown'),
+        layer_index(metadata.get('layer', event.get('layer', 'syscall'))),
+    )
+
+
+def utf_event(timestamp, duration, pid, tid, cpu, syscall, layer, **metadata):
+    """Build a UTF event dict in the documented ARCHITECTURE.md shape"""
+    return {
+        'timestamp_ns': timestamp,
+        'cpu': cpu,
+        'pid': pid,
+        'tid': tid,
+        'syscall': {'name': syscall},
+        'metadata': {'layer': layer, 'subsystem': LAYERS[layer], **metadata},
+        'metrics': {'duration_ns': duration},
+    }
+
+
+def intern_syscall(names, ids, name):
+    """Id of `name` in a (names list, ids dict) string table, adding it if new"""
+    sid = ids.get(name)
+    if sid is None:
+        sid = len(names)
+        if sid >= 1 << 16:
+            raise ValueError(f'More than {1 << 16} distinct syscall names')
+        names.append(name)
+        ids[name] = sid
+    return sid
+
+
+def record_fields(event, names, ids):
+    """RECORD field values of one UTF event, interning its syscall name"""
+    timestamp, duration, pid, tid, cpu, syscall, layer = event_fields(event)
+    return timestamp, duration, pid, tid, cpu, intern_syscall(names, ids, syscall), layer
+
+
+def record_event(fields, names, **metadata):
+    """UTF event dict from unpacked RECORD field values"""
+    timestamp, duration, pid, tid, cpu, sid, layer = fields
+    return utf_event(timestamp, duration, pid, tid, cpu, names[sid], layer, **metadata)
+
+
+class TraceIndex:
+    def __init__(self):
+        # Column store: one typed array per field, row id = position
+        self.columns = {
+            'timestamp': array('Q'),
+            'duration': array('Q'),
+            'pid': array('I'),
+            'tid': array('I'),
+            'cpu': array('H'),
+            'syscall': array('H'),
+            'layer': array('B'),
+        }
+
+        # Interned string tables for syscall names
+        self.syscall_names = []
+        self.syscall_ids = {}
+
+        # Secondary indexes: field -> value -> sorted posting array of row ids
+        self.postings = {field: {} for field in INDEXED_FIELDS}
+
+        # Built on first use and dropped on ingest: rows ordered by duration,
+        # and merged multi-value unions / duration ranges keyed by predicate
+        self._by_duration = None
+        self._sorted_durations = None
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.columns['timestamp'])
+
+    # ====================
+    # INGEST
+    # ====================
+    def add_event(self, event):
+        """Append one UTF event dict and update indexes"""
+        values = dict(zip(RECORD_FIELDS, record_fields(event, self.syscall_names, self.syscall_ids)))
+
+        row = len(self)
+        for field, column in self.columns.items():
+            column.append(values[field])
+
+        # Rows are appended in order, so each posting array stays sorted
+        for field in INDEXED_FIELDS:
+            index = self.postings[field]
+            posting = index.get(values[field])
+            if posting is None:
+                posting = index[values[field]] = array('I')
+            posting.append(row)
+
+        if self._by_duration is not None or self._cache:
+            self._by_duration = self._sorted_durations = None
+            self._cache.clear()
+        return row
+
+    def ingest(self, lines):
+        """Ingest an iterable of UTF JSON lines; returns the number of events added"""
+        count = 0
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self.add_event(json.loads(line))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f'Line {number}: {e}') from e
+            count += 1
+        return count
+
+    @classmethod
+    def from_file(cls, path):
+        index = cls()
+        with open(path) as f:
+            index.ingest(f)
+        return index
+
+    # ====================
+    # QUERY
+    # ====================
+    def _resolve(self, field, values):
+        """Map user-facing values (names, strings) to stored column values"""
+        resolved = set()
+        for value in values:
+            if field == 'syscall':
+                sid = self.syscall_ids.get(normalize_syscall(str(value)))
+                if sid is not None:
+                    resolved.add(sid)
+            elif field == 'layer':
+                try:
+                    resolved.add(layer_index(value))
+                except ValueError as e:
+                    raise QueryError(str(e)) from e
+            else:
+                try:
+                    resolved.add(int(value))
+                except ValueError:
+                    raise QueryError(f'{field} must be an integer, got {value!r}') from None
+        return resolved
+
+    def _union(self, field, wanted):
+        """Sorted row array matching any of `wanted`; multi-value unions are cached"""
+        lists = [self.postings[field][v] for v in wanted if v in self.postings[field]]
+        if len(lists) <= 1:
+            return lists[0] if lists else array('I')
+        key = (field, frozenset(wanted))
+        rows = self._cache.get(key)
+        if rows is None:
+            # Concatenated sorted runs: Timsort merges them in linear time
+            merged = array('I')
+            for posting in lists:
+                merged.extend(posting)
+            rows = self._remember(key, array('I', sorted(merged)))
+        return rows
+
+    def _duration_span(self, low, high):
+        """[start, stop) slice of the duration index with low <= duration <= high"""
+        if self._by_duration is None:
+            # Publish the order last: concurrent server threads test it first
+            durations = self.columns['duration']
+            order = array('I', sorted(range(len(self)), key=durations.__getitem__))
+            self._sorted_durations = array('Q', map(durations.__getitem__, order))
+            self._by_duration = order
+        start = 0 if low is None else bisect_left(self._sorted_durations, low)
+        stop = len(self) if high is None else bisect_right(self._sorted_durations, high)
+        return start, stop
+
+    def _remember(self, key, rows):
+        if len(self._cache) >= CACHE_ENTRIES:
+            self._cache.pop(next(iter(self._cache), None), None)
+        self._cache[key] = rows
+        return rows
+
+    def _plan(self, filters):
+        """Sorted row arrays, smallest first, plus [low, high) durations left to check
+
+        A duration range becomes a row array only when it is the most
+        selective predicate; otherwise its sorted-index size still guides
+        planning and rows are checked against the column. Returns
+        (None, None) when nothing can match.
+        """
+        filters = dict(filters)
+        min_duration = filters.pop('min_duration_ns', None)
+        max_duration = filters.pop('max_duration_ns', None)
+
+        plan = []
+        for field in INDEXED_FIELDS:
+            if filters.get(field) is None:
+                continue
+            values = filters.pop(field)
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = [values]
+            plan.append(self._union(field, self._resolve(field, values)))
+
+        if filters:
+            raise QueryError(f'Unknown filter(s): {", ".join(sorted(filters))}')
+        plan.sort(key=len)
+
+        span = None
+        if min_duration is not None or max_duration is not None:
+            start, stop = self._duration_span(min_duration, max_duration)
+            if not plan or stop - start < len(plan[0]):
+                key = ('duration', start, stop)
+                rows = self._cache.get(key)
+                if rows is None:
+                    rows = self._remember(key, array('I', sorted(self._by_duration[start:stop])))
+                plan.insert(0, rows)
+            else:
+                low = 0 if min_duration is None else min_duration
+                high = (1 << 64) if max_duration is None else max_duration + 1
+                span = (low, high)
+
+        if any(len(rows) == 0 for rows in plan):
+            return None, None
+        return plan, span
+
+    @staticmethod
+    def _intersect(plan):
+        """Lazily intersect sorted row arrays, driven by the smallest"""
+        driver, others = plan[0], plan[1:]
+        positions = [0] * len(others)
+        for row in driver:
+            for i, rows in enumerate(others):
+                # Gallop forward: rows only ever increase
+                pos = positions[i] = bisect_left(rows, row, positions[i])
+                if pos == len(rows):
+                    return
+                if rows[pos] != row:
+                    break
+            else:
+                yield row
+
+    def iter_rows(self, **filters):
+        """Yield matching row ids in timestamp (ingest) order"""
+        plan, span = self._plan(filters)
+        if plan is None:
+            return
+        if not plan:
+            rows = range(len(self))
+        elif len(plan) == 1:
+            rows = plan[0]
+        else:
+            rows = self._intersect(plan)
+        if span is None:
+            yield from rows
+        else:
+            durations, (low, high) = self.columns['duration'], span
+            yield from (row for row in rows if low <= durations[row] < high)
+
+    def query(self, offset=0, limit=100, count_total=True, **filters):
+        """Return a page of matching rows plus the total match count
+
+        A single predicate pages straight out of its (cached) row array,
+        so its total is free. Otherwise counting costs a set intersection
+        and a column check that are linear in the smallest row array;
+        with count_total=False the lazy intersection stops as soon as the
+        page is full (plus one row to know whether a next page exists),
+        and 'total' is then None.
+        """
+        if not count_total:
+            matches = list(islice(self.iter_rows(**filters), offset, offset + limit + 1))
+            next_offset = offset + limit if len(matches) > limit else None
+            return {'total': None, 'offset': offset, 'next_offset': next_offset, 'rows': matches[:limit]}
+
+        plan, span = self._plan(filters)
+        if plan is None:
+            matches = ()
+        elif not plan:
+            matches = range(len(self))
+        elif len(plan) == 1:
+            matches = plan[0]
+        else:
+            # set & array runs in C; only the smallest array is hashed
+            matches = sorted(set(plan[0]).intersection(*plan[1:]))
+        if span is not None:
+            durations, (low, high) = self.columns['duration'], span
+            matches = [row for row in matches if low <= durations[row] < high]
+
+        rows = list(matches[offset:offset + limit])
+        next_offset = offset + len(rows) if len(matches) > offset + limit else None
+        return {'total': len(matches), 'offset': offset, 'next_offset': next_offset, 'rows': rows}
+
+    # ====================
+    # SERIALIZATION
+    # ====================
+    def _record(self, row):
+        return tuple(self.columns[field][row] for field in RECORD_FIELDS)
+
+    def event(self, row):
+        """Materialize one row as a UTF event dict"""
+        return record_event(self._record(row), self.syscall_names)
+
+    def pack(self, rows):
+        """Encode rows as consecutive binary RECORD structs"""
+        buf = bytearray(RECORD.size * len(rows))
+        for i, row in enumerate(rows):
+            RECORD.pack_into(buf, i * RECORD.size, *self._record(row))
+        return bytes(buf)
+
+    def tables(self):
+        """String tables needed to decode binary records"""
+        return {
+            'record_format': RECORD.format,
+            'record_size': RECORD.size,
+            'fields': list(RECORD_FIELDS),
+            'syscalls': self.syscall_names,
+            'layers': LAYERS,
+            'events': len(self),
+        }
+
+
+# ====================
+# HTTP ENDPOINT
+# ====================
+class QueryHandler(BaseHTTPRequestHandler):
+    index = None
+    max_limit = 10_000
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self._send(status, body, 'application/json; charset=utf-8', headers)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == '/tables':
+            self._send_json(200, self.index.tables())
+            return
+
+        if url.path != '/query':
+            self._send_json(404, {'error': f'Unknown endpoint {url.path}'})
+            return
+
+        try:
+            filters = parse_query(params.get('q', ''))
+            offset = max(0, int(params.get('offset', 0)))
+            limit = min(self.max_limit, max(1, int(params.get('limit', 100))))
+            count_total = params.get('count', '1') != '0'
+            page = self.index.query(offset=offset, limit=limit, count_total=count_total, **filters)
+        except (QueryError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        headers = {}
+        if page['total'] is not None:
+            headers['X-Total-Count'] = str(page['total'])
+        if page['next_offset'] is not None:
+            headers['X-Next-Offset'] = str(page['next_offset'])
+
+        if params.get('format', 'utf') == 'binary':
+            self._send(200, self.index.pack(page['rows']), 'application/octet-stream', headers)
+        else:
+            payload = {k: page[k] for k in ('total', 'offset', 'next_offset')}
+            payload['events'] = [self.index.event(row) for row in page['rows']]
+            self._send_json(200, payload, headers)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(index, host='127.0.0.1', port=8001):
+    """Serve /query and /tables for an ingested index"""
+    handler = type('BoundQueryHandler', (QueryHandler,), {'index': index})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f'🌐 Serving {len(index)} events on http://{host}:{port}/query?q=...')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index a UTF trace and query it')
+    parser.add_argument('trace', type=Path, help='UTF trace file (one JSON event per line)')
+    parser.add_argument('--query', '-q', help='e.g. "pid=1337 AND cpu in {2,3} AND duration > 1ms"')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--offset', type=int, default=0)
+    parser.add_argument('--serve', action='store_true', help='Start the local HTTP query endpoint')
+    parser.add_argument('--port', type=int, default=8001)
+    args = parser.parse_args()
+
+    try:
+        index = TraceIndex.from_file(args.trace)
+        print(f'📥 Indexed {len(index)} events from {args.trace}')
+
+        if args.query is not None:
+            page = index.query(offset=args.offset, limit=args.limit, **parse_query(args.query))
+            print(f'🔍 {page["total"]} matching events')
+            for row in page['rows']:
+                print(json.dumps(index.event(row)))
+
+        if args.serve:
+            serve(index, port=args.port)
+        return 0
+
+    except FileNotFoundError as e:
+        print(f'\n❌ Error: Required file not found: {e}')
+        return 1
+    except ValueError as e:
+        print(f'\n❌ Error: {e}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
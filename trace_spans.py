@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Kernel Lens Tool Spans
+Opt-in timing spans for the Python tools, written as Chrome trace-event
+JSON (open in Perfetto / chrome://tracing) or as UTF JSON lines in the
+ARCHITECTURE.md shape (readable by trace_index.py, trace_chunks.py and
+trace_downsample.py).
+
+Tracing is off unless KERNEL_LENS_TRACE names an output file, or a tool
+calls enable(). While it is off, span() returns a shared no-op context
+manager and @traced functions pay one global lookup per call.
+"""
+
+import argparse
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from trace_index import utf_event
+
+TRACE_ENV = 'KERNEL_LENS_TRACE'
+FLUSH_EVENTS = 4096
+
+_tracer = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.add(self.name, self.cat, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Buffers complete spans and streams them to `path` in batches.
+
+    `*.jsonl` paths get UTF events on the user layer, named after the
+    span, with the category and args under `metadata`; anything else gets
+    the Chrome trace-event JSON array format, which tolerates a missing
+    `]` if the process dies before close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.utf = str(path).endswith('.jsonl')
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.epoch_ns = time.time_ns() - self.origin
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.file = open(path, 'w', buffering=1024 * 1024)
+        self.written = 0
+        if not self.utf:
+            self.file.write('[\n')
+            self._write_chrome([{
+                'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                'args': {'name': os.path.basename(sys.argv[0]) or 'python'},
+            }])
+
+    def span(self, name, cat, args):
+        return Span(self, name, cat, args)
+
+    def add(self, name, cat, start_ns, duration_ns, args):
+        event = (name, cat, start_ns, duration_ns, threading.get_native_id(), args)
+        with self.lock:
+            self.buffer.append(event)
+            if len(self.buffer) >= FLUSH_EVENTS:
+                self._flush()
+
+    def _write_chrome(self, events):
+        # One encoder call per batch; the list brackets are dropped so
+        # batches concatenate into a single streamed array
+        events = list(events)
+        if events:
+            self.file.write((',\n' if self.written else '') + json.dumps(events)[1:-1])
+            self.written += len(events)
+
+    def _flush(self):
+        events, self.buffer = self.buffer, []
+        if self.utf:
+            encode = json.JSONEncoder().encode
+            self.file.write(''.join(encode(utf_event(
+                self.epoch_ns + start, duration, self.pid, tid, 0, name, 0, category=cat, args=args,
+            )) + '\n' for name, cat, start, duration, tid, args in events))
+        else:
+            self._write_chrome({
+                'name': name, 'cat': cat, 'ph': 'X',
+                'ts': (start - self.origin) / 1000, 'dur': duration / 1000,
+                'pid': self.pid, 'tid': tid, 'args': args,
+            } for name, cat, start, duration, tid, args in events)
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self._flush()
+            if not self.utf:
+                self.file.write('\n]\n')
+            self.file.close()
+
+
+def enable(path):
+    """Start recording spans to `path`; the file is finalized at exit"""
+    global _tracer
+    disable()
+    _tracer = Tracer(path)
+    atexit.register(_tracer.close)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+        atexit.unregister(_tracer.close)
+        _tracer = None
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, cat='tool', **args):
+    """Context manager timing a block; a shared no-op while tracing is off"""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, cat, args)
+
+
+def traced(name=None, cat='tool'):
+    """Decorator form of span(); works on plain and async functions"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _tracer
+                if tracer is None:
+                    return await fn(*args, **kwargs)
+                with tracer.span(label, cat, {}):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(label, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
+
+
+# ====================
+# OVERHEAD
+# ====================
+def benchmark(iterations=200000):
+    """Per-call cost (ns) of spans and @traced, disabled vs enabled"""
+    def bare():
+        pass
+
+    decorated = traced('bench')(bare)
+
+    def measure(fn):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter_ns() - start) / iterations
+
+    def with_span():
+        with span('bench'):
+            pass
+
+    # Benchmark on private tracers; an active trace is set aside, not closed
+    global _tracer
+    was, _tracer = _tracer, None
+    try:
+        results = {'baseline_call': measure(bare)}
+        results['span_disabled'] = measure(with_span)
+        results['traced_disabled'] = measure(decorated)
+        for label, suffix in (('chrome', '.json'), ('utf', '.jsonl')):
+            fd, path = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+            _tracer = Tracer(path)
+            results[f'span_enabled_{label}'] = measure(with_span)
+            results[f'traced_enabled_{label}'] = measure(decorated)
+            _tracer.close()
+            os.unlink(path)
+    finally:
+        _tracer = was
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure Kernel Lens span overhead')
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations)
+    baseline = results.pop('baseline_call')
+    print(f'⏱️  Span overhead over {args.iterations} calls (empty function call: {baseline:.0f} ns)\n')
+    for label, ns in results.items():
+        print(f'  {label:24} {ns:8.0f} ns/call  (+{ns - baseline:.0f} ns)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())